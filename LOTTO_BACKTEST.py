@@ -0,0 +1,72 @@
+"""
+LOTTO_BACKTEST.py - 생성 방법별 과거 회차 백테스트
+각 회차마다 그 이전 회차만으로 분석한 LottoLogic 으로 번호를 생성해 실제 당첨번호와 비교
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from LOTTO_BITMASK import to_mask, masks_from_array, np_popcount
+from LOTTO_LOGIC import LottoLogic, GENERATION_METHODS
+
+# 일치 개수 -> 등수 (보너스 번호 데이터가 없으므로 5개 일치는 2/3등을 구분하지 않음)
+PRIZE_TIERS = {6: "1등", 5: "2/3등", 4: "4등", 3: "5등"}
+
+def _round_rng(entropy, index):
+    """회차별 독립 난수 생성기 - 워커 수와 무관하게 같은 결과"""
+    return np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(index,)))
+
+def _run_segment(past_winnings, lo, hi, keys, tickets, entropy):
+    """[lo, hi) 회차 구간 백테스트 - 구간 시작에서 한 번만 분석하고 이후 증분 갱신"""
+    logic = LottoLogic([list(game) for game in past_winnings[:lo]])
+    matches = np.zeros((len(keys), 7), dtype=np.int64)
+    for index in range(lo, hi):
+        draw = np.uint64(to_mask(past_winnings[index]))
+        rng = _round_rng(entropy, index)
+        for row, key in enumerate(keys):
+            batch = logic.generate_batch(key, tickets, rng)
+            counts = np_popcount(masks_from_array(batch) & draw)
+            matches[row] += np.bincount(counts, minlength=7)
+        logic.add_draws([past_winnings[index]])
+    return matches
+
+def backtest(past_winnings, keys=None, tickets=10000, min_history=1, workers=None, seed=None):
+    """생성 방법별 일치 개수/등수 분포 계산"""
+    if keys is None:
+        # 세트 단위 방법은 회차마다 tickets 게임 세트를 최적화하므로 기본 목록에서 제외 (keys 로 지정 가능)
+        keys = [method["key"] for method in GENERATION_METHODS if not method.get("set_level")]
+    keys = list(keys)
+    past_winnings = [sorted(game) for game in past_winnings]
+    start = max(1, min_history)
+    total = np.zeros((len(keys), 7), dtype=np.int64)
+    entropy = np.random.SeedSequence(seed).entropy
+
+    if start < len(past_winnings):
+        workers = workers or os.cpu_count() or 1
+        # 작업 균형을 위해 워커 수보다 잘게 나눔 (구간마다 초기 분석 1회)
+        parts = 1 if workers == 1 else min(workers * 4, len(past_winnings) - start)
+        bounds = np.linspace(start, len(past_winnings), parts + 1).astype(int)
+        segments = [(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:]) if lo < hi]
+        if workers == 1:
+            for lo, hi in segments:
+                total += _run_segment(past_winnings, lo, hi, keys, tickets, entropy)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_run_segment, past_winnings, lo, hi, keys, tickets, entropy) for lo, hi in segments]
+                for future in futures:
+                    total += future.result()
+
+    names = {method["key"]: method["name"] for method in GENERATION_METHODS}
+    results = {}
+    for row, key in enumerate(keys):
+        matches = total[row].tolist()
+        results[key] = {
+            "name": names.get(key, key),
+            "rounds": max(0, len(past_winnings) - start),
+            "tickets": sum(matches),
+            "matches": matches,
+            "tiers": {tier: matches[count] for count, tier in PRIZE_TIERS.items()},
+        }
+    return results
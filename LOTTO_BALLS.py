@@ -0,0 +1,71 @@
+"""
+LOTTO_BALLS.py - 로또 공 텍스처 캐시
+번호별 공 이미지를 처음 사용할 때 한 번만 그려 두고, 공 위젯은 텍스처 한 장짜리 사각형으로 표시
+"""
+
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Color, Ellipse, Fbo, Rectangle, ClearColor, ClearBuffers
+from kivy.uix.widget import Widget
+
+# 텍스처 해상도 (픽셀) - 표시 크기보다 크게 그려 축소 시에도 선명하게
+BALL_TEXTURE_SIZE = 128
+
+class BallTextures:
+    """번호 -> 공 텍스처 캐시 (색상 규칙별로 하나)
+
+    텍스처만이 아니라 Fbo 를 보관 - 안드로이드 일시정지/재개로 GL 컨텍스트를 잃으면 Kivy 가 살아 있는 Fbo 만
+    다시 만들고(텍스처 객체는 그대로) 내용은 비우므로 재생성 알림에서 다시 그림
+    """
+
+    def __init__(self, color_for_number, size=BALL_TEXTURE_SIZE, font_ratio=0.42):
+        self.color_for_number = color_for_number
+        self.size = size
+        self.font_ratio = font_ratio
+        self._fbos = {}
+
+    def get(self, number):
+        fbo = self._fbos.get(number)
+        if fbo is None:
+            fbo = self._fbos[number] = Fbo(size=(self.size, self.size))
+            fbo.add_reload_observer(lambda fbo, number=number: self._render(fbo, number))
+            self._render(fbo, number)
+        return fbo.texture
+
+    def _render(self, fbo, number):
+        """원 + 번호를 오프스크린 버퍼에 그림 (GL 컨텍스트가 있는 메인 스레드에서 호출)"""
+        size = self.size
+        label = CoreLabel(text=str(number), font_size=size * self.font_ratio, bold=True, color=(1, 1, 1, 1))
+        label.refresh()
+        text = label.texture
+
+        fbo.clear()
+        with fbo:
+            ClearColor(0, 0, 0, 0)
+            ClearBuffers()
+            Color(*self.color_for_number(number))
+            Ellipse(pos=(0, 0), size=(size, size))
+            Color(1, 1, 1, 1)
+            Rectangle(texture=text, pos=((size - text.width) / 2, (size - text.height) / 2), size=text.size)
+        fbo.draw()
+
+class TexturedBall(Widget):
+    """캐시된 텍스처 한 장으로 그리는 공 위젯 - 하위 클래스에서 textures 지정"""
+
+    textures = None
+
+    def __init__(self, number=0, **kwargs):
+        super().__init__(**kwargs)
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self.rect = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._update_rect, size=self._update_rect)
+        self.set_number(number)
+
+    def set_number(self, number):
+        """번호 변경 - 텍스처만 교체"""
+        self.number = number
+        self.rect.texture = self.textures.get(number)
+
+    def _update_rect(self, *args):
+        self.rect.pos = self.pos
+        self.rect.size = self.size
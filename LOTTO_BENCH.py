@@ -0,0 +1,202 @@
+"""
+LOTTO_BENCH.py - LottoLogic / 데이터 계층 벤치마크 (Kivy 창 없이 실행)
+
+    python LOTTO_BENCH.py                        # 측정 후 JSON 출력
+    python LOTTO_BENCH.py --save-baseline        # 기준값 저장
+    python LOTTO_BENCH.py --compare              # 기준값과 비교, 느려지면 종료 코드 1 (기준값이 없으면 안내 후 건너뜀)
+    python LOTTO_BENCH.py --check-determinism    # 백테스트가 워커 수와 무관하게 같은지 확인
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+from LOTTO_LOGIC import LottoLogic, GENERATION_METHODS
+from LOTTO_DATA import DrawCache, fetch_draws_paged
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BASELINE_FILE = "bench_baseline.json"
+HISTORY_SIZES = (1000, 10000, 100000, 1000000)
+QUICK_HISTORY_SIZES = (1000, 10000)
+SCALAR_TICKETS = 2000
+BATCH_TICKETS = 100000
+SET_TICKETS = 1000       # 세트 단위 방법의 배치 크기 (앱의 최대 게임 수)
+DECODE_ROWS = 50000  # 캐시 레코드의 회차 필드(16비트) 범위 안
+TOLERANCE = 0.25  # 기준 대비 허용 성능 저하 비율
+
+def _best(fn, repeat=3):
+    """repeat 회 실행 중 최소 소요 시간 (초)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def synthetic_history(rounds, seed=0):
+    """무작위 과거 당첨번호 rounds 회차"""
+    if np is not None:
+        return LottoLogic().generate_batch("random", rounds, np.random.default_rng(seed)).tolist()
+    rng = random.Random(seed)
+    return [sorted(rng.sample(range(1, 46), 6)) for _ in range(rounds)]
+
+class FakeTransport:
+    """Supabase REST 흉내 - 미리 인코딩한 JSON 페이지를 돌려줌 (네트워크 없음)"""
+
+    def __init__(self, history):
+        self.rows = [
+            {"round": i + 1, "num1": g[0], "num2": g[1], "num3": g[2], "num4": g[3], "num5": g[4], "num6": g[5]}
+            for i, g in enumerate(history)
+        ]
+
+    def get(self, table, params):
+        filters = [value for name, value in params if name == "round"]
+        if not filters:
+            return json.loads(json.dumps(self.rows[-1:]))
+        low = int(filters[0].split(".")[1])
+        high = int(filters[1].split(".")[1])
+        return json.loads(json.dumps(self.rows[low - 1:high - 1]))
+
+def bench_strategies(results, logic):
+    """전략별 게임 생성 처리량 (게임/초)"""
+    for method in GENERATION_METHODS:
+        key = method["key"]
+        generate = getattr(logic, f"generate_{key}")
+        elapsed = _best(lambda: [generate() for _ in range(SCALAR_TICKETS)])
+        results[f"strategy.{key}.scalar"] = {"value": SCALAR_TICKETS / elapsed, "unit": "tickets/s", "better": "higher"}
+        if np is not None:
+            rng = np.random.default_rng(0)
+            n = SET_TICKETS if method.get("set_level") else BATCH_TICKETS
+            elapsed = _best(lambda: logic.generate_batch(key, n, rng))
+            results[f"strategy.{key}.batch"] = {"value": n / elapsed, "unit": "tickets/s", "better": "higher"}
+
+def bench_analysis(results, sizes):
+    """과거 회차 수별 LottoLogic 생성/분석 시간과 회차 추가 비용"""
+    for size in sizes:
+        history = synthetic_history(size)
+        repeat = 1 if size >= 100000 else 3
+        elapsed = _best(lambda: LottoLogic([list(g) for g in history]), repeat)
+        results[f"init.{size}"] = {"value": elapsed, "unit": "s", "better": "lower"}
+
+        logic = LottoLogic(history[:-100])
+        start = time.perf_counter()
+        for game in history[-100:]:
+            logic.add_draws([game])
+        results[f"add_draws.{size}"] = {"value": (time.perf_counter() - start) / 100, "unit": "s/round", "better": "lower"}
+
+def bench_decode(results):
+    """페이지 단위 로드 + 행 디코딩 처리량 (가짜 응답)"""
+    transport = FakeTransport(synthetic_history(DECODE_ROWS))
+    elapsed = _best(lambda: fetch_draws_paged(transport, DrawCache()))
+    results["load.decode_rows"] = {"value": DECODE_ROWS / elapsed, "unit": "rows/s", "better": "higher"}
+
+def bench_widgets(results, skipped):
+    """GameCard 생성 비용 - Kivy/KivyMD 와 GL 컨텍스트가 있을 때만"""
+    try:
+        os.environ.setdefault("KIVY_NO_ARGS", "1")
+        from LOTTO_MOBILE import GameCard, LottoMobileApp
+        LottoMobileApp()  # KivyMD 테마 사용을 위한 앱 인스턴스
+        elapsed = _best(lambda: [GameCard(i + 1, [1, 11, 21, 31, 41, 45]) for i in range(50)])
+        results["widget.game_card"] = {"value": elapsed / 50, "unit": "s", "better": "lower"}
+    except Exception as e:
+        skipped["widget.game_card"] = str(e)
+
+def run(quick=False, widgets=True):
+    results, skipped = {}, {}
+    bench_strategies(results, LottoLogic(synthetic_history(1100)))
+    bench_analysis(results, QUICK_HISTORY_SIZES if quick else HISTORY_SIZES)
+    bench_decode(results)
+    if widgets:
+        bench_widgets(results, skipped)
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__ if np is not None else None,
+            "machine": platform.machine(),
+            "quick": quick,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+def check_determinism(workers=2, rounds=300, tickets=500, seed=3):
+    """같은 시드의 백테스트가 workers=1 과 workers=N 에서 같은지 - 다른 생성 방법 목록 반환"""
+    from LOTTO_BACKTEST import backtest
+
+    history = synthetic_history(rounds, seed)
+    single = backtest(history, tickets=tickets, workers=1, seed=seed)
+    parallel = backtest(history, tickets=tickets, workers=workers, seed=seed)
+    return [key for key in single if single[key]["matches"] != parallel[key]["matches"]]
+
+def compare(report, baseline, tolerance=TOLERANCE):
+    """기준 대비 tolerance 이상 느려진 항목 목록"""
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        current = report["results"].get(name)
+        if current is None or not base["value"]:
+            continue
+        if base["better"] == "higher":
+            change = 1 - current["value"] / base["value"]
+        else:
+            change = current["value"] / base["value"] - 1
+        if change > tolerance:
+            regressions.append((name, base["value"], current["value"], change))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lotto Gem 벤치마크")
+    parser.add_argument("--quick", action="store_true", help="과거 회차 1만까지만 측정")
+    parser.add_argument("--no-widgets", action="store_true", help="위젯 생성 측정 생략")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="기준값 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--compare", action="store_true", help="기준값과 비교")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="허용 성능 저하 비율")
+    parser.add_argument("--check-determinism", action="store_true", help="백테스트 결과가 워커 수와 무관한지만 확인")
+    args = parser.parse_args(argv)
+
+    if args.check_determinism:
+        mismatched = check_determinism()
+        for key in mismatched:
+            print(f"워커 수에 따라 결과가 다름: {key}", file=sys.stderr)
+        return 1 if mismatched else 0
+
+    report = run(quick=args.quick, widgets=not args.no_widgets)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    if args.compare:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            # 기준값은 측정한 기기에 따라 달라 저장소에 두지 않음 - 처음 실행한 기기에서 만들어 둠
+            print(f"기준값 파일을 읽을 수 없어 비교를 건너뜀 ({args.baseline}: {e})\n"
+                  f"  python LOTTO_BENCH.py --save-baseline 으로 이 기기의 기준값을 먼저 저장하세요", file=sys.stderr)
+            return 0
+        regressions = compare(report, baseline, args.tolerance)
+        for name, before, after, change in regressions:
+            print(f"성능 저하: {name} {before:.4g} -> {after:.4g} ({change:+.0%})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
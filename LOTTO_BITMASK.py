@@ -0,0 +1,92 @@
+"""
+LOTTO_BITMASK.py - 비트마스크 기반 번호 조합 표현
+번호 n 은 (n - 1) 번째 비트, 한 게임은 45비트 정수 하나
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy가 없으면 순수 파이썬 경로 사용
+    np = None
+
+ALL_NUMBERS = (1 << 45) - 1
+
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+else:
+    def popcount(mask):
+        """1인 비트 수"""
+        return bin(mask).count('1')
+
+def to_mask(numbers):
+    """번호 목록 -> 비트마스크"""
+    mask = 0
+    for num in numbers:
+        mask |= 1 << (num - 1)
+    return mask
+
+def from_mask(mask):
+    """비트마스크 -> 정렬된 번호 목록"""
+    numbers = []
+    while mask:
+        low = mask & -mask
+        numbers.append(low.bit_length())
+        mask ^= low
+    return numbers
+
+def pack_masks(games):
+    """번호 목록들 -> uint64 배열 (게임당 8바이트)"""
+    return array('Q', (to_mask(game) for game in games))
+
+def unpack_masks(masks):
+    """마스크들 -> 정렬된 번호 목록들 (pack_masks 의 역 - 목록이 필요한 곳에서만 만듦)"""
+    return [from_mask(mask) for mask in masks]
+
+def match_count(a, b):
+    """두 조합의 일치 개수"""
+    return popcount(a & b)
+
+def contains(mask, sub):
+    """mask 가 sub 의 번호를 모두 포함하는지"""
+    return mask & sub == sub
+
+def union(masks):
+    """여러 조합이 덮는 번호 전체"""
+    covered = 0
+    for mask in masks:
+        covered |= mask
+    return covered
+
+def as_uint64(masks):
+    """array('Q')/리스트/넘파이 배열 -> uint64 넘파이 배열 (가능하면 복사 없이)"""
+    if isinstance(masks, array):
+        return np.frombuffer(masks, dtype=np.uint64) if len(masks) else np.empty(0, dtype=np.uint64)
+    return np.asarray(masks, dtype=np.uint64)
+
+if np is not None:
+    _BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def np_popcount(values):
+    """uint64 배열 원소별 1인 비트 수"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    return _BYTE_POPCOUNT[values.view(np.uint8)].reshape(values.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+def masks_from_array(games):
+    """(n, 6) 번호 배열 -> uint64 마스크 배열"""
+    games = np.asarray(games, dtype=np.uint64)
+    return np.bitwise_or.reduce(np.left_shift(np.uint64(1), games - np.uint64(1)), axis=1)
+
+def array_from_masks(masks):
+    """6개 번호 마스크 배열 -> (n, 6) 정렬된 번호 배열 (masks_from_array 의 역)"""
+    bits = (as_uint64(masks)[:, None] >> np.arange(45, dtype=np.uint64)) & np.uint64(1)
+    return np.nonzero(bits)[1].reshape(-1, 6) + 1
+
+def bulk_match_counts(tickets, draws):
+    """티켓 x 회차 일치 개수 행렬"""
+    if np is None:
+        return [[popcount(t & d) for d in draws] for t in tickets]
+    return np_popcount(as_uint64(tickets)[:, None] & as_uint64(draws)[None, :])
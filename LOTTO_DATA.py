@@ -0,0 +1,313 @@
+"""
+LOTTO_DATA.py - 당첨번호 데이터 계층
+Supabase REST 페이지 단위 병렬 로드, 동행복권 회차 수집, 로컬 회차 캐시 (Kivy 의존성 없음)
+"""
+
+import base64
+import os
+import random
+import re
+import struct
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from LOTTO_BITMASK import from_mask, to_mask, unpack_masks
+
+# requests 는 무거워서 실제로 전송을 만들 때 가져옴 (_session)
+
+# --- Configuration ---
+_SB_URL = "aHR0cHM6Ly9uaXd0enZ3Y29kbW1qdm54Ynp4Zi5zdXBhYmFzZS5jbw=="
+_SB_KEY = "ZXlKaGJHY2lPaUpJVXpJMU5pSXNJblI1Y0NJNklrcFhWQ0o5LmV5SnBjM01pT2lKemRYQmhZbUZ6WlNJc0luSmxaaUk2SW01cGQzUjZkbmRqYjJSdGJXcDJibmhpZW5obUlpd2ljbTlzWlNJNkltRnViMjRpTENKcFlYUWlPakUzTlRFM056VTVORGdzSW1WNGNDaTZNakEyTnpNMU1UazBPSDAuTnQ1dHN1ZHc4aXBJcEFqbkYwNDV2T0VnTms2Uk5mV0dzOHFCTmRSMlk2bw=="
+
+def _decode_config():
+    """설정 디코딩"""
+    try:
+        url = base64.b64decode(_SB_URL).decode()
+        key = base64.b64decode(_SB_KEY).decode()
+        return url, key
+    except:
+        return None, None
+
+SUPABASE_URL, SUPABASE_KEY = _decode_config()
+BASE_URL = "https://www.dhlottery.co.kr/gameResult.do?method=byWin&drwNo={}"
+CACHE_FILE = "lotto_draws.bin"
+
+
+# Supabase 테이블/컬럼
+TABLE = "lotto_data"
+COLUMNS = "round,num1,num2,num3,num4,num5,num6"
+PAGE_SIZE = 200
+FETCH_WORKERS = 4
+
+def decode_rows(data):
+    """응답 행(dict) -> 검증된 (회차, 정렬된 번호) 목록"""
+    rows = []
+    for row in data or []:
+        try:
+            numbers = [row['num1'], row['num2'], row['num3'], row['num4'], row['num5'], row['num6']]
+            round_no = int(row['round'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if all(isinstance(x, int) and 1 <= x <= 45 for x in numbers) and len(set(numbers)) == 6:
+            rows.append((round_no, sorted(numbers)))
+    return rows
+
+def _session(pool_size, headers):
+    """연결 풀 크기를 지정한 requests 세션"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(headers)
+    return session
+
+class PostgrestTransport:
+    """Supabase REST(PostgREST) HTTP 전송 - 세션 하나의 연결 풀을 공유"""
+    
+    def __init__(self, url, key, pool_size=FETCH_WORKERS, timeout=10):
+        self.base_url = url.rstrip('/') + "/rest/v1/"
+        self.timeout = timeout
+        self.session = _session(pool_size, {"apikey": key, "Authorization": f"Bearer {key}"})
+
+    def get(self, table, params):
+        """테이블 조회 - params 는 (이름, 값) 목록 (같은 컬럼 필터 반복 가능)"""
+        response = self.session.get(self.base_url + table, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+def latest_round(transport):
+    """서버의 마지막 회차 (없으면 0)"""
+    data = transport.get(TABLE, [("select", "round"), ("order", "round.desc"), ("limit", "1")])
+    return int(data[0]['round']) if data else 0
+
+def fetch_draws_paged(transport, store, page_size=PAGE_SIZE, workers=FETCH_WORKERS):
+    """store 이후 회차를 page_size 범위로 나눠 동시에 요청, 회차 순서대로 검증해 store 에 추가"""
+    last = latest_round(transport)
+    first = store.last_round + 1
+    ranges = [(lo, min(lo + page_size, last + 1)) for lo in range(first, last + 1, page_size)]
+    if not ranges:
+        return []
+    
+    added = []
+    with ThreadPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [
+            pool.submit(transport.get, TABLE, [
+                ("select", COLUMNS), ("round", f"gte.{lo}"), ("round", f"lt.{hi}"), ("order", "round"),
+            ])
+            for lo, hi in ranges
+        ]
+        try:
+            # 앞 페이지부터 도착하는 대로 디코딩 - 캐시는 항상 회차 순으로 유지
+            for future in futures:
+                added.extend(store.append(decode_rows(future.result())))
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+    return added
+
+class DrawCache:
+    """회차별 당첨번호 로컬 캐시 (고정 길이 바이너리 레코드, 회차 오름차순)
+
+    메모리에는 회차별 번호 마스크만 보관 - 번호 목록(draws)은 요청할 때 만듦
+    """
+    
+    RECORD = struct.Struct('<H7B')  # 회차, 번호 6개, 보너스 (0 = 모름)
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.rounds = []
+        self.masks = array('Q')
+        self.bonuses = array('B')  # 0 = 모름
+        self._load()
+
+    def __len__(self):
+        return len(self.rounds)
+
+    @property
+    def draws(self):
+        """회차별 정렬된 번호 목록 (보관하지 않고 마스크에서 만듦)"""
+        return unpack_masks(self.masks)
+
+    def _load(self):
+        """캐시 파일 읽기 - 잘린 레코드나 순서가 어긋난 레코드는 무시"""
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return
+        
+        valid = len(data) - len(data) % self.RECORD.size
+        for round_no, *numbers, bonus in self.RECORD.iter_unpack(data[:valid]):
+            if (round_no > self.last_round and all(1 <= x <= 45 for x in numbers) and len(set(numbers)) == 6
+                    and (bonus == 0 or (bonus <= 45 and bonus not in numbers))):
+                self.rounds.append(round_no)
+                self.masks.append(to_mask(numbers))
+                self.bonuses.append(bonus)
+        
+        if valid != len(data):
+            # 기록 중 중단된 마지막 레코드 제거
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid)
+
+    @property
+    def last_round(self):
+        return self.rounds[-1] if self.rounds else 0
+
+    def results(self, start=0):
+        """start 번째 회차부터 (회차, 번호, 보너스 또는 None) 목록 - TicketStore.check 입력 형식"""
+        return [(self.rounds[i], from_mask(self.masks[i]), self.bonuses[i] or None)
+                for i in range(start, len(self.rounds))]
+
+    def append(self, rows):
+        """(회차, 번호) 또는 (회차, 번호, 보너스) 목록 중 캐시보다 새로운 회차만 추가 - 추가한 번호 목록 반환"""
+        added = []
+        records = bytearray()
+        for row in rows:
+            round_no, numbers = row[0], row[1]
+            if round_no <= self.last_round:
+                continue
+            numbers = sorted(numbers)
+            bonus = (row[2] if len(row) > 2 else None) or 0
+            self.rounds.append(round_no)
+            self.masks.append(to_mask(numbers))
+            self.bonuses.append(bonus)
+            records += self.RECORD.pack(round_no, *numbers, bonus)
+            added.append(numbers)
+        
+        if records and self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'ab') as f:
+                f.write(records)
+        return added
+
+# --- 동행복권 회차 수집 ---
+FIRST_DRAW = datetime(2002, 12, 7, 21, 0)  # 1회 추첨 (KST)
+KST = timezone(timedelta(hours=9))
+SCRAPE_WORKERS = 8
+SCRAPE_RATE = 20.0  # 초당 최대 요청 수
+
+_ROUND_RE = re.compile(r'<strong>\s*(\d+)\s*회\s*</strong>')
+_BALL_RE = re.compile(r'<span class="ball_645[^"]*">\s*(\d+)\s*</span>')
+_WIN_RE = re.compile(r'class="num win".*?</p>', re.S)
+_BONUS_RE = re.compile(r'class="num bonus".*?</p>', re.S)
+
+def parse_round_page(html):
+    """당첨결과 페이지 -> (회차, 번호, 보너스), 결과가 없으면 None (bs4 없이 필요한 부분만 파싱)"""
+    round_match = _ROUND_RE.search(html)
+    win_match = _WIN_RE.search(html)
+    if not round_match or not win_match:
+        return None
+    
+    numbers = [int(x) for x in _BALL_RE.findall(win_match.group())]
+    bonus_match = _BONUS_RE.search(html, win_match.end())
+    bonus = _BALL_RE.findall(bonus_match.group()) if bonus_match else []
+    if len(numbers) != 6 or len(set(numbers)) != 6 or not all(1 <= x <= 45 for x in numbers):
+        return None
+    return int(round_match.group(1)), sorted(numbers), int(bonus[0]) if bonus else None
+
+def latest_expected_round(now=None):
+    """날짜 기준으로 이미 추첨된 마지막 회차 (매주 토요일)"""
+    now = now or datetime.now(KST).replace(tzinfo=None)
+    return max(0, (now - FIRST_DRAW).days // 7 + 1)
+
+class RateLimiter:
+    """요청 시작 간격 제한 (스레드 안전)"""
+    
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+class RoundScraper:
+    """동행복권 회차별 당첨번호 수집 - 공유 세션, 동시 요청 수 제한, 재시도/백오프"""
+    
+    def __init__(self, url_template=BASE_URL, workers=SCRAPE_WORKERS, per_second=SCRAPE_RATE, retries=3, backoff=0.5, timeout=10):
+        self.url_template = url_template
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = RateLimiter(per_second)
+        self.session = _session(workers, {"User-Agent": "Mozilla/5.0 (Linux; Android) LottoGemMobile"})
+
+    def fetch_round(self, round_no):
+        """한 회차 수집 - 해당 회차 결과가 아직 없으면 None"""
+        import requests
+        
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            try:
+                response = self.session.get(self.url_template.format(round_no), timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+            else:
+                # 429/5xx 만 재시도
+                if response.status_code != 429 and response.status_code < 500 or attempt == self.retries:
+                    break
+            time.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+        response.raise_for_status()
+        
+        try:
+            html = response.content.decode('utf-8')
+        except UnicodeDecodeError:
+            html = response.content.decode('euc-kr', errors='replace')
+        result = parse_round_page(html)
+        # 없는 회차를 요청하면 최신 회차 페이지가 오므로 회차 번호를 확인
+        return result if result and result[0] == round_no else None
+
+    def fetch_rounds(self, rounds):
+        """여러 회차 동시 수집 - 회차 순서대로 (회차, 번호, 보너스 또는 None) 생성"""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [(round_no, pool.submit(self.fetch_round, round_no)) for round_no in rounds]
+            try:
+                for round_no, future in futures:
+                    yield round_no, future.result()
+            finally:
+                for _, future in futures:
+                    future.cancel()
+
+    def close(self):
+        self.session.close()
+
+def update_draws(store, scraper=None, latest=None):
+    """store 이후 누락 회차를 수집해 회차 순으로 추가 - 결과가 없는 회차에서 중단"""
+    latest = latest if latest is not None else latest_expected_round()
+    rounds = range(store.last_round + 1, latest + 1)
+    if not rounds:
+        return []
+    
+    own = scraper is None
+    scraper = scraper or RoundScraper()
+    added = []
+    try:
+        for round_no, result in scraper.fetch_rounds(rounds):
+            if result is None:
+                break
+            added.extend(store.append([result]))
+    finally:
+        if own:
+            scraper.close()
+    return added
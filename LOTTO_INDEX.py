@@ -0,0 +1,124 @@
+"""
+LOTTO_INDEX.py - 과거 당첨번호 역색인 (번호 -> 그 번호가 나온 회차 비트셋)
+"이 게임과 k개 이상 겹친 회차" 를 회차 전체 비교 대신 번호 6개의 비트셋 덧셈으로 계산하고,
+배치 생성 필터용으로 과거 회차에 나온 k개 번호 조합 표를 만들어 후보 행을 한 번에 검사
+"""
+
+import itertools
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy가 없으면 배치 필터(excluded)만 비활성화
+    np = None
+
+from LOTTO_BITMASK import array_from_masks, to_mask
+
+class DrawIndex:
+    """번호별 회차 비트셋 - 비트 i 는 i 번째 회차 (파이썬 정수라 회차 수 제한 없음)"""
+
+    def __init__(self, rows=()):
+        self.bitsets = [0] * 46
+        self.masks = array('Q')  # 회차별 번호 마스크 (조합 표를 만들 때 사용)
+        self._tables = {}  # k -> 과거 회차에 나온 k개 번호 조합 표 (조합 순위 -> bool)
+        self.extend(rows)
+
+    def __len__(self):
+        return len(self.masks)
+
+    def extend(self, rows):
+        """회차 추가 - 이미 만든 조합 표도 증분 갱신"""
+        rows = [sorted(row) for row in rows]
+        if not rows:
+            return
+        bitsets, start = self.bitsets, len(self.masks)
+        for i, game in enumerate(rows, start):
+            bit = 1 << i
+            for num in game:
+                bitsets[num] |= bit
+        self.masks.extend(to_mask(game) for game in rows)
+        for k, table in self._tables.items():
+            table[_subset_ranks(np.array(rows, dtype=np.intp), k).ravel()] = True
+
+    def overlap_bits(self, numbers):
+        """회차별 일치 개수를 2진 자리별 비트셋 (1, 2, 4) 으로 - 번호 비트셋을 비트 단위 가산기로 더함"""
+        ones = twos = fours = 0
+        for num in set(numbers):
+            bits = self.bitsets[num]
+            carry = ones & bits
+            ones ^= bits
+            fours |= twos & carry
+            twos ^= carry
+        return ones, twos, fours
+
+    def near(self, numbers, k):
+        """numbers 와 k개 이상 겹친 회차 비트셋"""
+        ones, twos, fours = self.overlap_bits(numbers)
+        if k <= 0:
+            return (1 << len(self.masks)) - 1
+        return (
+            ones | twos | fours,    # 1+
+            twos | fours,           # 2+
+            fours | (twos & ones),  # 3+
+            fours,                  # 4+
+            fours & (twos | ones),  # 5+
+            fours & twos,           # 6+
+        )[k - 1] if k <= 6 else 0
+
+    def rounds(self, numbers, k):
+        """numbers 와 k개 이상 겹친 회차 위치 목록 (오름차순)"""
+        bits = self.near(numbers, k)
+        found = []
+        while bits:
+            low = bits & -bits
+            found.append(low.bit_length() - 1)
+            bits ^= low
+        return found
+
+    def max_overlap(self, numbers):
+        """과거 회차와 가장 많이 겹친 개수 (회차가 없으면 0)"""
+        for k in range(6, 0, -1):
+            if self.near(numbers, k):
+                return k
+        return 0
+
+    def allowed(self, numbers, max_overlap):
+        """어느 과거 회차와도 max_overlap 개 이하로만 겹치는지"""
+        return not self.near(numbers, max_overlap + 1)
+
+    def _table(self, k):
+        table = self._tables.get(k)
+        if table is None:
+            table = np.zeros(math.comb(45, k), dtype=bool)
+            if self.masks:
+                table[_subset_ranks(array_from_masks(self.masks).astype(np.intp), k).ravel()] = True
+            self._tables[k] = table
+        return table
+
+    def excluded(self, games, max_overlap):
+        """(n, 6) 번호 배열 중 어떤 과거 회차와 max_overlap 개보다 많이 겹치는 행 (bool 배열)
+
+        k = max_overlap + 1 개 번호 조합 C(6, k) 개를 과거 조합 표에서 조회 - 회차 수와 무관
+        """
+        if max_overlap < 0:
+            raise ValueError("max_overlap 은 0 이상이어야 합니다")
+        games = np.asarray(games, dtype=np.intp)
+        k = max_overlap + 1
+        if k > 6 or not self.masks:
+            return np.zeros(len(games), dtype=bool)
+        return self._table(k)[_subset_ranks(np.sort(games, axis=1), k)].any(axis=1)
+
+_COMB = [[math.comb(n, r) for r in range(7)] for n in range(45)]
+_COLUMNS = {k: list(itertools.combinations(range(6), k)) for k in range(1, 7)}
+
+def _subset_ranks(games, k):
+    """(n, 6) 정렬된 번호 -> (n, C(6, k)) k개 번호 조합의 조합수 체계 순위"""
+    comb = np.array(_COMB, dtype=np.int64)
+    columns = np.array(_COLUMNS[k], dtype=np.intp)
+    positions = games[:, columns] - 1
+    ranks = np.zeros(positions.shape[:2], dtype=np.int64)
+    for j in range(k):
+        ranks += comb[positions[:, :, j], j + 1]
+    return ranks
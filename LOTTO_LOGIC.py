@@ -0,0 +1,975 @@
+"""
+LOTTO_LOGIC.py - 로또 번호 생성/분석 로직
+Kivy 의존성 없이 앱, 백테스트, 워커 프로세스에서 공통으로 사용
+"""
+
+import copy
+import functools
+import itertools
+import math
+import random
+from array import array
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy가 없으면 배치 생성 비활성화
+    np = None
+
+from LOTTO_BITMASK import to_mask, from_mask, unpack_masks, popcount, as_uint64, np_popcount
+from LOTTO_METHODS import GENERATION_METHODS
+
+# 배치 생성 시 한 번에 처리할 최대 행 수 (메모리 사용량 제한)
+BATCH_CHUNK = 65536
+
+# 합계 구간 전략의 기본 백분위 범위 (과거 당첨번호 합계 기준)
+SUM_BAND = (10, 90)
+
+# 핫/콜드 분석 구간 (최근 회차 수, None = 전체)
+WINDOWS = (10, 50, 100, None)
+
+# 한 회차 안의 번호 쌍 (열 인덱스)
+PAIR_COLUMNS = list(itertools.combinations(range(6), 2))
+
+# 제외 필터로 거른 행을 다시 뽑는 최대 횟수 (조건이 너무 강하면 오류)
+FILTER_ROUNDS = 100
+
+# 게임 세트를 한 번에 만드는 방법 - 제외 필터를 후보 선택 단계에 적용
+SET_LEVEL_KEYS = {method["key"] for method in GENERATION_METHODS if method.get("set_level")}
+
+def as_generator(rng=None):
+    """random.Random 또는 numpy Generator -> numpy Generator (배치/커버리지 생성용)
+
+    random.Random 이면 그 상태에서 뽑은 시드로 만들므로 같은 시드면 같은 결과 (None 이면 전역 random 사용)
+    """
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng((rng or random).getrandbits(128))
+
+def as_random(rng=None):
+    """numpy Generator 또는 random.Random -> random.Random 호환 객체 (게임 하나 생성용, None 이면 전역 random)"""
+    if np is not None and isinstance(rng, np.random.Generator):
+        return random.Random(int(rng.integers(2 ** 63)))
+    return rng or random
+
+class AliasTable:
+    """가중치 비례 추출용 별칭 테이블 (Vose)"""
+    
+    def __init__(self, items, weights):
+        self.items = list(items)
+        self.weights = [float(w) for w in weights]
+        self.total = sum(self.weights)
+        self.positive = sum(1 for w in self.weights if w > 0)
+        
+        n = len(self.items)
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        scaled = [w * n / self.total for w in self.weights] if self.total else [1.0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s], self.alias[s] = scaled[s], l
+            scaled[l] -= 1 - scaled[s]
+            (small if scaled[l] < 1 else large).append(l)
+
+    def _draw_index(self, rng=random):
+        """O(1) 복원 추출 - 난수 하나로 열과 동전을 모두 결정"""
+        r = rng.random() * len(self.items)
+        i = int(r)
+        return i if r - i < self.prob[i] else self.alias[i]
+
+    def _draw_residual(self, seen, removed, rng=random):
+        """이미 뽑힌 번호를 제외한 잔여 분포에서 추출"""
+        u = rng.random() * (self.total - removed)
+        last = None
+        for i, w in enumerate(self.weights):
+            if i in seen or w <= 0:
+                continue
+            last = i
+            u -= w
+            if u < 0:
+                return i
+        return last
+
+    def sample_batch(self, n, k, rng):
+        """sample(k) 를 n 행 동시에 - 중복 행만 잔여 분포에서 다시 추출"""
+        size = len(self.items)
+        prob = np.array(self.prob)
+        alias = np.array(self.alias, dtype=np.intp)
+        weights = np.array(self.weights)
+        
+        out = np.empty((n, k), dtype=np.intp)
+        seen = np.zeros(n, dtype=np.uint64)
+        for j in range(k):
+            r = rng.random(n) * size
+            i = r.astype(np.intp)
+            idx = np.where(r - i < prob[i], i, alias[i])
+            if j:
+                rows = np.nonzero((seen >> idx.astype(np.uint64)) & np.uint64(1))[0]
+                if len(rows):
+                    residual = np.tile(weights, (len(rows), 1))
+                    residual[np.arange(len(rows))[:, None], out[rows, :j]] = 0
+                    cum = residual.cumsum(axis=1)
+                    u = rng.random(len(rows)) * cum[:, -1]
+                    idx[rows] = np.minimum((cum <= u[:, None]).sum(axis=1), size - 1)
+            out[:, j] = idx
+            seen |= np.left_shift(np.uint64(1), idx.astype(np.uint64))
+        return np.array(self.items)[out]
+
+    def sample(self, k, rng=None):
+        """비복원 k개 추출 - 중복이 나오면 재시도 없이 잔여 분포에서 바로 추출"""
+        rng = rng or random
+        seen = set()
+        removed = 0.0
+        picked = []
+        while len(picked) < k:
+            i = self._draw_index(rng)
+            if i in seen:
+                i = self._draw_residual(seen, removed, rng)
+            seen.add(i)
+            removed += self.weights[i]
+            picked.append(self.items[i])
+        return picked
+
+class ConstrainedSampler:
+    """조건을 만족하는 조합 중 균등 추출 - 완성 가능한 조합 수 테이블로 순위를 바로 조합으로 변환 (거절 없음)"""
+    
+    def __init__(self, odd=None, ranges=None, sums=None, k=6, n=45):
+        self.k, self.n = k, n
+        self.odd = odd
+        self.ranges = tuple(sorted(ranges)) if ranges else ()
+        self.sums = sums
+        
+        # 제약이 없는 차원은 크기 1로 접어서 테이블을 작게 유지
+        self._odd_dim = min(k, odd[1]) + 1 if odd else 1
+        self._range_dim = k + 1 if ranges else 1
+        self._sum_dim = min(sums[1], sum(range(n - k + 1, n + 1))) + 1 if sums else 1
+        self._in_range = [False] * (n + 2)
+        self._range_end = {}
+        for start, end, low, high in self.ranges:
+            for x in range(start, end + 1):
+                self._in_range[x] = True
+            self._range_end[end + 1] = (low, high)
+        
+        self.table = self._build()
+        self.total = self.table[1][0]
+
+    def _index(self, picked, odd, count, total):
+        return ((picked * self._odd_dim + odd) * self._range_dim + count) * self._sum_dim + total
+
+    def _step(self, i, odd, count, total):
+        """번호 i 를 골랐을 때 다음 상태 (범위를 벗어나면 None)"""
+        odd += i & 1 if self.odd else 0
+        count += 1 if self._in_range[i] else 0
+        total += i if self.sums else 0
+        if odd >= self._odd_dim or count >= self._range_dim or total >= self._sum_dim:
+            return None
+        return odd, count, total
+
+    def _build(self):
+        """table[i][상태] = 번호 i..n 으로 조건을 완성하는 조합 수"""
+        k, n = self.k, self.n
+        states = [(j, o, c, t) for j in range(k + 1) for o in range(self._odd_dim)
+                  for c in range(self._range_dim) for t in range(self._sum_dim)]
+        size = len(states)
+        
+        last = [0] * size
+        quota = self._range_end.get(n + 1)
+        for st, (j, o, c, t) in enumerate(states):
+            ok = j == k and (quota is None or quota[0] <= c <= quota[1])
+            ok = ok and (not self.odd or self.odd[0] <= o) and (not self.sums or self.sums[0] <= t)
+            last[st] = 1 if ok else 0
+        
+        table = [None] * (n + 2)
+        table[n + 1] = last
+        for i in range(n, 0, -1):
+            nxt = table[i + 1]
+            cur = [0] * size
+            quota = self._range_end.get(i)
+            for st, (j, o, c, t) in enumerate(states):
+                if quota is not None:
+                    if not quota[0] <= c <= quota[1]:
+                        continue
+                    c = 0
+                count = nxt[self._index(j, o, c, t)]
+                if j < k:
+                    taken = self._step(i, o, c, t)
+                    if taken:
+                        count += nxt[self._index(j + 1, *taken)]
+                cur[st] = count
+            table[i] = cur
+        return table
+
+    def unrank(self, rank):
+        """0 <= rank < total 인 순위 -> 오름차순 조합"""
+        table, in_range, range_end = self.table, self._in_range, self._range_end
+        odd_on, sum_on = bool(self.odd), bool(self.sums)
+        odd_dim, range_dim, sum_dim = self._odd_dim, self._range_dim, self._sum_dim
+        picked = odd = count = total = 0
+        numbers = []
+        for i in range(1, self.n + 1):
+            if i in range_end:
+                count = 0
+            next_odd = odd + (i & 1) if odd_on else 0
+            next_count = count + 1 if in_range[i] else count
+            next_total = total + i if sum_on else 0
+            if next_odd < odd_dim and next_count < range_dim and next_total < sum_dim:
+                with_i = table[i + 1][(((picked + 1) * odd_dim + next_odd) * range_dim + next_count) * sum_dim + next_total]
+                if rank < with_i:
+                    numbers.append(i)
+                    picked += 1
+                    if picked == self.k:
+                        break
+                    odd, count, total = next_odd, next_count, next_total
+                    continue
+                rank -= with_i
+        return numbers
+
+    def sample(self, rng=None):
+        """조건을 만족하는 조합 하나를 균등 추출"""
+        if not self.total:
+            raise ValueError("조건을 만족하는 조합이 없습니다")
+        return self.unrank((rng or random).randrange(self.total))
+
+    def sample_batch(self, n, rng):
+        """unrank 를 n 행 동시에 - (n, k) 오름차순 배열"""
+        if not self.total:
+            raise ValueError("조건을 만족하는 조합이 없습니다")
+        table = getattr(self, '_np_table', None)
+        if table is None:
+            table = self._np_table = np.array(self.table[1:], dtype=np.int64)
+        
+        rank = rng.integers(0, self.total, size=n, dtype=np.int64)
+        picked = np.zeros(n, dtype=np.int64)
+        odd = np.zeros(n, dtype=np.int64)
+        count = np.zeros(n, dtype=np.int64)
+        total = np.zeros(n, dtype=np.int64)
+        chosen = np.zeros((n, self.n), dtype=bool)
+        for i in range(1, self.n + 1):
+            if i in self._range_end:
+                count[:] = 0
+            next_odd = odd + (i & 1 if self.odd else 0)
+            next_count = count + (1 if self._in_range[i] else 0)
+            next_total = total + (i if self.sums else 0)
+            valid = (picked < self.k) & (next_odd < self._odd_dim) & (next_count < self._range_dim) & (next_total < self._sum_dim)
+            index = self._index(np.minimum(picked + 1, self.k), np.minimum(next_odd, self._odd_dim - 1),
+                                np.minimum(next_count, self._range_dim - 1), np.minimum(next_total, self._sum_dim - 1))
+            with_i = np.where(valid, table[i][index], 0)
+            take = rank < with_i
+            rank -= np.where(take, 0, with_i)
+            chosen[:, i - 1] = take
+            picked += take
+            odd = np.where(take, next_odd, odd)
+            count = np.where(take, next_count, count)
+            total = np.where(take, next_total, total)
+        return np.nonzero(chosen)[1].reshape(n, self.k) + 1
+
+@functools.lru_cache(maxsize=None)
+def constrained_sampler(odd=None, ranges=None, sums=None):
+    """조건별 샘플러 - 테이블은 조건당 한 번만 생성되어 모든 인스턴스가 공유"""
+    return ConstrainedSampler(odd=odd, ranges=ranges, sums=sums)
+
+class SumTable:
+    """합계별 조합 수 테이블 - ways[i][j][t] = 번호 i..n 에서 j개를 골라 합이 정확히 t 인 경우의 수"""
+    
+    def __init__(self, k=6, n=45):
+        self.k, self.n = k, n
+        self.max_sum = sum(range(n - k + 1, n + 1))
+        size = self.max_sum + 1
+        ways = [None] * (n + 2)
+        ways[n + 1] = [[1 if j == 0 and t == 0 else 0 for t in range(size)] for j in range(k + 1)]
+        for i in range(n, 0, -1):
+            nxt = ways[i + 1]
+            cur = [list(row) for row in nxt]
+            for j in range(1, k + 1):
+                row, prev = cur[j], nxt[j - 1]
+                for t in range(i, size):
+                    row[t] += prev[t - i]
+            ways[i] = cur
+        self.ways = ways
+        self.by_sum = ways[1][k]
+
+    def count(self, low, high):
+        """합계가 [low, high] 인 조합 수"""
+        return sum(self.by_sum[max(low, 0):min(high, self.max_sum) + 1])
+
+    def unrank(self, low, rank):
+        """합계 low 부터 (합계, 사전순) 순서로 rank 번째 조합"""
+        target = max(low, 0)
+        while rank >= self.by_sum[target]:
+            rank -= self.by_sum[target]
+            target += 1
+        
+        numbers = []
+        remaining = self.k
+        for i in range(1, self.n + 1):
+            if not remaining:
+                break
+            with_i = self.ways[i + 1][remaining - 1][target - i] if target >= i else 0
+            if rank < with_i:
+                numbers.append(i)
+                remaining -= 1
+                target -= i
+            else:
+                rank -= with_i
+        return numbers
+
+    def sample(self, low, high, rng=None):
+        """합계가 [low, high] 인 조합 균등 추출"""
+        total = self.count(low, high)
+        if not total:
+            raise ValueError("조건을 만족하는 조합이 없습니다")
+        return self.unrank(low, (rng or random).randrange(total))
+
+    def sample_batch(self, n, low, high, rng):
+        """sample 을 n 행 동시에 - (n, k) 오름차순 배열"""
+        total = self.count(low, high)
+        if not total:
+            raise ValueError("조건을 만족하는 조합이 없습니다")
+        ways = getattr(self, '_np_ways', None)
+        if ways is None:
+            ways = self._np_ways = np.array(self.ways[1:], dtype=np.int64)
+        
+        low, high = max(low, 0), min(high, self.max_sum)
+        cum = np.cumsum(self.by_sum[low:high + 1])
+        rank = rng.integers(0, total, size=n, dtype=np.int64)
+        offset = np.searchsorted(cum, rank, side='right')
+        rank -= np.where(offset > 0, cum[np.maximum(offset - 1, 0)], 0)
+        target = offset + low
+        remaining = np.full(n, self.k, dtype=np.int64)
+        chosen = np.zeros((n, self.n), dtype=bool)
+        for i in range(1, self.n + 1):
+            valid = (remaining > 0) & (target >= i)
+            with_i = np.where(valid, ways[i][np.maximum(remaining - 1, 0), np.maximum(target - i, 0)], 0)
+            take = rank < with_i
+            rank -= np.where(take, 0, with_i)
+            chosen[:, i - 1] = take
+            remaining -= take
+            target -= np.where(take, i, 0)
+        return np.nonzero(chosen)[1].reshape(n, self.k) + 1
+
+@functools.lru_cache(maxsize=None)
+def sum_table():
+    """합계 테이블 - 프로세스당 한 번만 생성"""
+    return SumTable()
+
+class WindowCounter:
+    """최근 size 회차 번호 빈도 (None = 전체) - 링 버퍼로 회차당 O(1) 갱신, 빈도순 정렬 상태 유지"""
+    
+    def __init__(self, size=None):
+        self.size = size
+        self._reset()
+
+    def _reset(self):
+        self.ring = [None] * self.size if self.size else None
+        self.pos = 0
+        self.rounds = 0
+        self.counts = [0] * 46
+        # order: 빈도 내림차순 번호 배열, 같은 빈도는 [first, last] 연속 구간
+        self.order = list(range(1, 46))
+        self.index = [None] + list(range(45))
+        self.first = {0: 0}
+        self.last = {0: 44}
+        self._hot_cold = None  # hot_cold() 결과 - 빈도가 바뀌면 비움
+
+    def _swap(self, i, j):
+        order, index = self.order, self.index
+        order[i], order[j] = order[j], order[i]
+        index[order[i]], index[order[j]] = i, j
+
+    def _increment(self, num):
+        """빈도 c -> c+1: c 구간의 맨 앞으로 옮기고 구간 경계만 이동"""
+        c = self.counts[num]
+        f = self.first[c]
+        self._swap(self.index[num], f)
+        if c + 1 in self.last:
+            self.last[c + 1] = f
+        else:
+            self.first[c + 1] = self.last[c + 1] = f
+        if self.last[c] == f:
+            del self.first[c], self.last[c]
+        else:
+            self.first[c] = f + 1
+        self.counts[num] = c + 1
+
+    def _decrement(self, num):
+        """빈도 c -> c-1: c 구간의 맨 뒤로 옮기고 구간 경계만 이동"""
+        c = self.counts[num]
+        l = self.last[c]
+        self._swap(self.index[num], l)
+        if c - 1 in self.first:
+            self.first[c - 1] = l
+        else:
+            self.first[c - 1] = self.last[c - 1] = l
+        if self.first[c] == l:
+            del self.first[c], self.last[c]
+        else:
+            self.last[c] = l - 1
+        self.counts[num] = c - 1
+
+    def push(self, game):
+        """새 회차 추가 - 구간을 벗어난 가장 오래된 회차는 제거"""
+        self._hot_cold = None
+        if self.size:
+            old = self.ring[self.pos]
+            if old is not None:
+                for num in old:
+                    self._decrement(num)
+            self.ring[self.pos] = game
+            self.pos = (self.pos + 1) % self.size
+            self.rounds = min(self.rounds + 1, self.size)
+        else:
+            self.rounds += 1
+        for num in game:
+            self._increment(num)
+
+    def extend(self, rows):
+        """여러 회차 추가 - 구간보다 많으면 마지막 size 회차만 반영"""
+        if self.size and len(rows) >= self.size:
+            self._reset()
+            rows = rows[-self.size:]
+        elif not self.size and len(rows) > 64:
+            # 전체 구간 대량 적재는 한 번 정렬로 다시 구성
+            for game in rows:
+                for num in game:
+                    self.counts[num] += 1
+            self.rounds += len(rows)
+            self._rebuild()
+            return
+        for game in rows:
+            self.push(game)
+
+    def _rebuild(self):
+        self._hot_cold = None
+        self.order = sorted(range(1, 46), key=lambda num: (-self.counts[num], num))
+        self.index = [None] * 46
+        self.first, self.last = {}, {}
+        for i, num in enumerate(self.order):
+            self.index[num] = i
+            c = self.counts[num]
+            self.first.setdefault(c, i)
+            self.last[c] = i
+
+    def hot_cold(self):
+        """(핫 번호 빈도 내림차순, 콜드 번호 빈도 오름차순) - 평균 빈도 기준
+
+        같은 빈도 안의 order 순서는 쌓은 방식(push/extend)에 따라 달라지므로 번호순으로 정렬해 반환 -
+        같은 시드면 분석 경로와 무관하게 같은 게임이 나오도록 (결과는 회차가 추가될 때까지 재사용, 수정하지 말 것)
+        """
+        if self._hot_cold is not None:
+            return self._hot_cold
+        seen = 45 - (self.last[0] - self.first[0] + 1 if 0 in self.first else 0)
+        if not seen:
+            return [], []
+        avg = self.rounds * 6 / seen
+        hot = []
+        for num in self.order:
+            if self.counts[num] <= avg:
+                break
+            hot.append(num)
+        cold = []
+        for num in reversed(self.order):
+            if self.counts[num] >= avg:
+                break
+            cold.append(num)
+        counts = self.counts
+        hot.sort(key=lambda num: (-counts[num], num))
+        cold.sort(key=lambda num: (counts[num], num))
+        self._hot_cold = hot, cold
+        return self._hot_cold
+
+# 홀수/짝수 균형 조건 (홀수 2~4개)
+BALANCE_ODD = (2, 4)
+# 숫자 범위 분포 조건 (시작, 끝, 최소, 최대)
+RANGE_QUOTAS = ((1, 15, 2, 2), (16, 30, 2, 2), (31, 45, 2, 2))
+
+class LottoLogic:
+    """로또 번호 생성 로직"""
+    
+    def __init__(self, past_winnings=None):
+        self._patterns_analyzed = False
+        self.number_freq = Counter()
+        self.hot_numbers, self.cold_numbers = [], []
+        self.sum_stats = {'min': 111, 'max': 170, 'avg': 140}
+        self.pattern_sampler = None
+        self.draw_masks = array('Q')
+        self.sum_freq = Counter()
+        self.pair_counts = array('I', [0]) * (46 * 46)
+        self._sum_total = 0
+        self._sum_windows = {}
+        self._pair_tables = None
+        self._triple_counts = None
+        self._draw_index = None
+        self.windows = {size: WindowCounter(size) for size in WINDOWS}
+        rows = [sorted(game) for game in past_winnings or ()]
+        if rows:
+            self._accumulate(rows)
+            self._analyze_patterns()
+
+    @property
+    def past_winnings(self):
+        """과거 당첨번호 목록 - 회차 기록은 draw_masks 하나만 보관하고 목록은 요청할 때 만듦"""
+        return unpack_masks(self.draw_masks)
+
+    def draw(self, index):
+        """index 번째 회차 번호 (past_winnings[index] 를 목록 전체 없이)"""
+        return from_mask(self.draw_masks[index])
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """미리 집계한 스냅샷(LOTTO_SNAPSHOT.Snapshot)으로 복원 - 과거 회차를 다시 집계하지 않음"""
+        logic = cls()
+        count = len(snapshot)
+        if not count:
+            return logic
+
+        logic.draw_masks.frombytes(snapshot.masks.tobytes())
+        logic.pair_counts = array('I', snapshot.pair_counts.tobytes())
+        freq = snapshot.number_freq.tolist()
+        logic.number_freq = Counter({num: freq[num] for num in range(1, 46) if freq[num]})
+        sums = snapshot.sum_freq.tolist()
+        logic.sum_freq = Counter({total: c for total, c in enumerate(sums) if c})
+        logic._sum_total = sum(total * c for total, c in logic.sum_freq.items())
+        logic.sum_stats = {'min': min(logic.sum_freq), 'max': max(logic.sum_freq), 'avg': logic._sum_total / count}
+
+        for size, window in logic.windows.items():
+            if size is None:
+                window.counts = freq
+                window.rounds = count
+                window._rebuild()
+            else:
+                window.extend(unpack_masks(logic.draw_masks[-size:]))
+        logic._analyze_patterns()
+        return logic
+
+    def _accumulate(self, rows):
+        """빈도/합계 누적 (추가된 회차만 처리)"""
+        sums = [sum(game) for game in rows]
+        for game in rows:
+            self.number_freq.update(game)
+            self.draw_masks.append(to_mask(game))
+        self.sum_freq.update(sums)
+        self._sum_windows = {}
+        for window in self.windows.values():
+            window.extend(rows)
+        self._accumulate_pairs(rows)
+        if self._draw_index is not None:
+            self._draw_index.extend(rows)
+        
+        count = len(self.draw_masks)
+        if count == len(rows):
+            low, high = min(sums), max(sums)
+        else:
+            low, high = min(self.sum_stats['min'], *sums), max(self.sum_stats['max'], *sums)
+        self._sum_total += sum(sums)
+        self.sum_stats = {'min': low, 'max': high, 'avg': self._sum_total / count}
+
+    def _accumulate_pairs(self, rows):
+        """동반 출현 쌍/삼중 카운트 누적"""
+        if np is not None and len(rows) >= 64:
+            # 한 번의 벡터 연산으로 (a, b), (b, a) 모두 집계
+            games = np.array(rows, dtype=np.intp)
+            first = games[:, [a for a, b in PAIR_COLUMNS]]
+            second = games[:, [b for a, b in PAIR_COLUMNS]]
+            index = np.concatenate([first * 46 + second, second * 46 + first]).ravel()
+            np.frombuffer(self.pair_counts, dtype=np.uint32)[:] += np.bincount(index, minlength=46 * 46).astype(np.uint32)
+        else:
+            counts = self.pair_counts
+            for game in rows:
+                for a, b in itertools.combinations(game, 2):
+                    counts[a * 46 + b] += 1
+                    counts[b * 46 + a] += 1
+        
+        if self._triple_counts is not None:
+            for game in rows:
+                self._triple_counts.update(itertools.combinations(sorted(game), 3))
+        self._pair_tables = None
+
+    def pair_count(self, a, b):
+        """두 번호가 같은 회차에 나온 횟수"""
+        return self.pair_counts[a * 46 + b]
+
+    def triple_count(self, a, b, c):
+        """세 번호가 같은 회차에 나온 횟수 (첫 호출 시 희소 인덱스 생성 후 증분 갱신)"""
+        if self._triple_counts is None:
+            self._triple_counts = Counter()
+            for mask in self.draw_masks:
+                self._triple_counts.update(itertools.combinations(from_mask(mask), 3))
+        return self._triple_counts[tuple(sorted((a, b, c)))]
+
+    def _cooccurrence_tables(self):
+        """번호별 동반 출현 별칭 테이블 (+1 평활화, 자기 자신 제외) - 쌍 카운트가 바뀌면 다시 생성"""
+        if self._pair_tables is None:
+            counts = self.pair_counts
+            tables = [None]
+            for c in range(1, 46):
+                weights = [counts[c * 46 + x] + 1 if x != c else 0 for x in range(1, 46)]
+                tables.append(AliasTable(range(1, 46), weights))
+            self._pair_tables = tables
+        return self._pair_tables
+
+    def add_draws(self, rows):
+        """새 회차 추가 - 통계를 증분 갱신하고 빈도 의존 구조만 다시 생성"""
+        rows = [sorted(row) for row in rows]
+        if not rows:
+            return
+        
+        self._accumulate(rows)
+        self._patterns_analyzed = False
+        self._analyze_patterns()
+
+    def with_draws(self, rows):
+        """새 회차를 추가한 복사본 - 이 로직은 그대로 두므로 생성 중인 작업과 공유한 채 다른 스레드에서 만들고 참조만 교체"""
+        logic = copy.copy(self)
+        logic.draw_masks = array('Q', self.draw_masks)
+        logic.pair_counts = array('I', self.pair_counts)
+        logic.number_freq = Counter(self.number_freq)
+        logic.sum_freq = Counter(self.sum_freq)
+        logic.sum_stats = dict(self.sum_stats)
+        logic._sum_windows = {}
+        logic._triple_counts = Counter(self._triple_counts) if self._triple_counts is not None else None
+        # 역색인은 증분 갱신이 원본의 조합 표까지 바꾸므로 공유하지 않고 필요할 때 새로 만듦
+        logic._draw_index = None
+        logic.windows = copy.deepcopy(self.windows)
+        logic.add_draws(rows)
+        return logic
+
+    def match_counts(self, numbers):
+        """과거 각 회차와의 일치 개수"""
+        ticket = to_mask(numbers)
+        if np is not None:
+            return np_popcount(as_uint64(self.draw_masks) & np.uint64(ticket))
+        return [popcount(ticket & mask) for mask in self.draw_masks]
+
+    def draw_index(self):
+        """번호 -> 회차 비트셋 역색인 (첫 호출 시 생성 후 증분 갱신)"""
+        if self._draw_index is None:
+            from LOTTO_INDEX import DrawIndex
+            self._draw_index = DrawIndex(self.past_winnings)
+        return self._draw_index
+
+    def near_matches(self, numbers, k=3):
+        """numbers 와 k개 이상 겹친 과거 회차 (draw_masks 위치) 목록"""
+        return self.draw_index().rounds(numbers, k)
+
+    def max_overlap(self, numbers):
+        """numbers 와 과거 회차의 최대 일치 개수"""
+        return self.draw_index().max_overlap(numbers)
+
+    def _analyze_patterns(self):
+        """패턴 분석"""
+        if not self.draw_masks or self._patterns_analyzed: 
+            return
+        
+        self.hot_numbers, self.cold_numbers = self.windows[None].hot_cold()
+        self._build_pattern_sampler()
+        self._patterns_analyzed = True
+
+    def _build_pattern_sampler(self):
+        """빈도 기반 별칭 테이블 생성 (빈도가 바뀔 때만 호출)"""
+        weights = [self.number_freq.get(num, 0) for num in range(1, 46)]
+        self.pattern_sampler = AliasTable(range(1, 46), weights)
+
+    def generate_random(self, rng=None):
+        """기본 랜덤 (rng: random.Random 인스턴스 - 모든 generate_* 공통, 없으면 전역 random)"""
+        return sorted((rng or random).sample(range(1, 46), 6))
+
+    def generate_pattern(self, rng=None):
+        """패턴 분석 (자주 나온 번호)"""
+        if not self.draw_masks or not self.pattern_sampler: 
+            return self.generate_random(rng)
+        if self.pattern_sampler.positive < 6:
+            return self.generate_random(rng)
+        
+        return sorted(self.pattern_sampler.sample(6, rng))
+
+    def hot_cold(self, window=None):
+        """최근 window 회차 기준 (핫, 콜드) 번호 - 처음 요청한 구간은 이후 증분 갱신"""
+        if window is None:
+            return self.hot_numbers, self.cold_numbers
+        if window not in self.windows:
+            counter = WindowCounter(window)
+            counter.extend(unpack_masks(self.draw_masks[-window:]))
+            self.windows[window] = counter
+        return self.windows[window].hot_cold()
+
+    def generate_hot_cold_mix(self, window=None, rng=None):
+        """핫/콜드 번호 조합 (window: 최근 회차 수, None = 전체)"""
+        if not self.draw_masks:
+            return self.generate_random(rng)
+        
+        rng = rng or random
+        hot_numbers, cold_numbers = self.hot_cold(window)
+        numbers = set()
+        if hot_numbers:
+            numbers.update(rng.sample(hot_numbers, min(3, len(hot_numbers))))
+        if cold_numbers:
+            numbers.update(rng.sample(cold_numbers, min(3, len(cold_numbers))))
+        
+        while len(numbers) < 6:
+            numbers.add(rng.randint(1, 45))
+        
+        return sorted(rng.sample(sorted(numbers), 6))
+
+    def generate_balance(self, rng=None):
+        """홀수/짝수 균형"""
+        return constrained_sampler(odd=BALANCE_ODD).sample(rng)
+
+    def generate_range_distribution(self, rng=None):
+        """숫자 범위 분포 (구간별 2개씩 - 조건을 만족하는 조합 중 균등)"""
+        return constrained_sampler(ranges=RANGE_QUOTAS).sample(rng)
+
+    def sum_window(self, band=SUM_BAND):
+        """과거 당첨번호 합계의 백분위 구간 (low, high) - 데이터가 없으면 sum_stats 기본값"""
+        window = self._sum_windows.get(band)
+        if window is not None:
+            return window
+        if not self.sum_freq:
+            return self.sum_stats['min'], self.sum_stats['max']
+        
+        count = len(self.draw_masks)
+        low_at, high_at = band[0] / 100 * count, band[1] / 100 * count
+        low = high = None
+        seen = 0
+        for total in sorted(self.sum_freq):
+            seen += self.sum_freq[total]
+            if low is None and seen > low_at:
+                low = total
+            if seen >= high_at:
+                high = total
+                break
+        window = self._sum_windows[band] = (low, high if high is not None else self.sum_stats['max'])
+        return window
+
+    def generate_sum_window(self, band=SUM_BAND, rng=None):
+        """합계 구간 (과거 합계 백분위 범위 안에서 균등)"""
+        return sum_table().sample(*self.sum_window(band), rng)
+
+    def generate_cooccurrence(self, rng=None):
+        """동반 출현 (이미 고른 번호와 함께 자주 나온 번호 우선)"""
+        if not self.draw_masks or not self.pattern_sampler:
+            return self.generate_random(rng)
+        
+        rng = rng or random
+        tables = self._cooccurrence_tables()
+        numbers = [self.pattern_sampler.items[self.pattern_sampler._draw_index(rng)]]
+        seen = set(numbers)
+        mass = tables[numbers[0]].total
+        while len(numbers) < 6:
+            # 고른 번호들의 행 합 분포 = 행 합계 비례로 행을 고른 뒤 그 행에서 추출
+            u = rng.random() * mass
+            for c in numbers:
+                u -= tables[c].total
+                if u < 0:
+                    break
+            num = tables[c].items[tables[c]._draw_index(rng)]
+            if num in seen:
+                num = self._cooccurrence_residual(tables, numbers, seen, rng)
+            numbers.append(num)
+            seen.add(num)
+            mass += tables[num].total
+        return sorted(numbers)
+
+    def generate_coverage(self, rng=None):
+        """커버리지 조합 - 한 게임만으로는 덮을 것이 없으므로 기본 랜덤 (여러 게임은 generate_batch)"""
+        return self.generate_random(rng)
+
+    def generate_covering(self, pool, t=3, rng=None, max_overlap=None):
+        """pool 의 모든 t개 번호 조합을 덮는 게임 목록 - 당첨번호 중 t개가 pool 에 있으면 한 게임 이상 t개 이상 일치"""
+        if np is None:
+            raise RuntimeError("커버리지 조합에는 numpy가 필요합니다")
+        from LOTTO_WHEEL import covering_tickets
+        exclude = None
+        if max_overlap is not None:
+            exclude = functools.partial(self.draw_index().excluded, max_overlap=max_overlap)
+        return covering_tickets(pool, t, as_generator(rng), exclude).tolist()
+
+    def generate(self, method, max_overlap=None, **options):
+        """한 게임 생성 - max_overlap 이 있으면 어느 과거 회차와도 그 개수 이하로만 겹칠 때까지 다시 생성
+
+        (max_overlap=5: 이미 1등이 나온 조합 제외, 3: 과거 회차와 4개 이상 겹치는 조합 제외)
+        rng 는 random.Random 과 numpy Generator 모두 가능 (generate_batch 와 같은 객체를 넘겨도 됨)
+        """
+        name = method[len('generate_'):] if method.startswith('generate_') else method
+        generate = getattr(self, f'generate_{name}')
+        if options.get('rng') is not None and name != 'covering':
+            options['rng'] = as_random(options['rng'])
+        if max_overlap is None:
+            return generate(**options)
+        index = self.draw_index()
+        for _ in range(FILTER_ROUNDS * 10):
+            numbers = generate(**options)
+            if index.allowed(numbers, max_overlap):
+                return numbers
+        raise ValueError("제외 조건을 만족하는 조합을 찾지 못했습니다")
+
+    @staticmethod
+    def _cooccurrence_residual(tables, numbers, seen, rng=random):
+        """이미 고른 번호를 제외한 행 합 분포에서 직접 추출"""
+        weights = [sum(column) for column in zip(*(tables[c].weights for c in numbers))]
+        for num in seen:
+            weights[num - 1] = 0.0
+        return rng.choices(range(1, 46), weights=weights)[0]
+
+    def generate_batch(self, method, n, rng=None, max_overlap=None, **options):
+        """배치 생성 - (n, 6) 정렬된 번호 배열 반환 (options 는 전략별 인자, 예: window, band)
+
+        max_overlap: 어느 과거 회차와도 이 개수보다 많이 겹치는 행은 다시 뽑음 (generate 참고)
+        rng: numpy Generator 또는 random.Random (as_generator 로 변환)
+        """
+        if np is None:
+            raise RuntimeError("배치 생성에는 numpy가 필요합니다")
+        if callable(method):
+            method = method.__name__
+        name = method[len('generate_'):] if method.startswith('generate_') else method
+        sampler = getattr(self, f'_batch_{name}', None)
+        if sampler is None:
+            raise ValueError(f"알 수 없는 생성 방법: {method}")
+        
+        rng = as_generator(rng)
+        excluded = None
+        if max_overlap is not None:
+            excluded = functools.partial(self.draw_index().excluded, max_overlap=max_overlap)
+            if name in SET_LEVEL_KEYS:
+                options = dict(options, exclude=excluded)
+                excluded = None
+        
+        result = np.empty((n, 6), dtype=np.uint8)
+        # 세트 단위 방법은 게임들이 서로를 고려하므로 나누지 않고 n 게임 전체를 한 번에 생성
+        chunk_size = n if name in SET_LEVEL_KEYS else BATCH_CHUNK
+        for start in range(0, n, max(chunk_size, 1)):
+            stop = min(start + chunk_size, n)
+            chunk = sampler(stop - start, rng, **options)
+            if excluded is not None:
+                chunk = self._refill_excluded(chunk, excluded, sampler, rng, options)
+            result[start:stop] = chunk
+        result.sort(axis=1)
+        return result
+
+    @staticmethod
+    def _refill_excluded(chunk, excluded, sampler, rng, options):
+        """제외된 행만 같은 전략으로 다시 뽑아 채움 (전략의 분포를 조건부로 유지)"""
+        chunk = np.array(chunk, dtype=np.intp)
+        rows = np.flatnonzero(excluded(chunk))
+        for _ in range(FILTER_ROUNDS):
+            if not len(rows):
+                return chunk
+            chunk[rows] = sampler(len(rows), rng, **options)
+            rows = rows[excluded(chunk[rows])]
+        if len(rows):
+            raise ValueError("제외 조건을 만족하는 조합을 찾지 못했습니다")
+        return chunk
+
+    @staticmethod
+    def _partial_shuffle(n, size, k, rng):
+        """각 행마다 range(size) 에서 k개 균등 비복원 추출 (부분 Fisher-Yates)"""
+        perm = np.tile(np.arange(size, dtype=np.int8), (n, 1))
+        rows = np.arange(n)
+        for i in range(k):
+            j = i + (rng.random(n) * (size - i)).astype(np.intp)
+            picked = perm[rows, j]
+            perm[rows, j] = perm[:, i]
+            perm[:, i] = picked
+        return perm[:, :k].astype(np.intp)
+
+    @staticmethod
+    def _fill_uniform(chosen, rng):
+        """이미 고른 번호(0 기반)를 제외한 나머지에서 6개가 될 때까지 균등 추출"""
+        n = len(chosen)
+        while chosen.shape[1] < 6:
+            taken = np.sort(chosen, axis=1)
+            v = (rng.random(n) * (45 - taken.shape[1])).astype(np.intp)
+            # v 번째 남은 번호로 이동 - 오름차순으로 지나간 번호 수만큼 증가
+            for col in range(taken.shape[1]):
+                v += v >= taken[:, col]
+            chosen = np.concatenate([chosen, v[:, None]], axis=1)
+        return chosen
+
+    def _batch_random(self, n, rng):
+        """기본 랜덤 (배치)"""
+        return self._partial_shuffle(n, 45, 6, rng) + 1
+
+    def _batch_pattern(self, n, rng):
+        """패턴 분석 (배치) - 별칭 테이블 벡터화"""
+        if not self.pattern_sampler or self.pattern_sampler.positive < 6:
+            return self._batch_random(n, rng)
+        return self.pattern_sampler.sample_batch(n, 6, rng)
+
+    def _batch_hot_cold_mix(self, n, rng, window=None):
+        """핫/콜드 번호 조합 (배치)"""
+        if not self.draw_masks:
+            return self._batch_random(n, rng)
+        
+        parts = []
+        for group in self.hot_cold(window):
+            if group:
+                cols = np.array(group, dtype=np.intp) - 1
+                parts.append(cols[self._partial_shuffle(n, len(cols), min(3, len(cols)), rng)])
+        chosen = np.concatenate(parts, axis=1) if parts else np.empty((n, 0), dtype=np.intp)
+        
+        # 부족한 번호는 남은 번호 중 균등 추출
+        return self._fill_uniform(chosen, rng) + 1
+
+    def _batch_balance(self, n, rng):
+        """홀수/짝수 균형 (배치) - 홀수 개수를 정확한 비율로 뽑아 조합"""
+        odd_counts = np.array([2, 3, 4])
+        weights = np.array([math.comb(23, k) * math.comb(22, 6 - k) for k in odd_counts], dtype=np.float64)
+        k = odd_counts[np.searchsorted(np.cumsum(weights) / weights.sum(), rng.random(n), side='right')]
+        
+        odds = self._partial_shuffle(n, 23, 4, rng) * 2 + 1
+        evens = self._partial_shuffle(n, 22, 4, rng) * 2 + 2
+        cols = np.arange(4)
+        mask = np.concatenate([cols < k[:, None], cols < (6 - k)[:, None]], axis=1)
+        return np.concatenate([odds, evens], axis=1)[mask].reshape(n, 6)
+
+    def _batch_sum_window(self, n, rng, band=SUM_BAND):
+        """합계 구간 (배치)"""
+        return sum_table().sample_batch(n, *self.sum_window(band), rng)
+
+    def _batch_cooccurrence(self, n, rng):
+        """동반 출현 (배치)"""
+        if not self.draw_masks or not self.pattern_sampler:
+            return self._batch_random(n, rng)
+        
+        tables = self._cooccurrence_tables()
+        prob = np.array([[0.0] * 45] + [table.prob for table in tables[1:]])
+        alias = np.array([[0] * 45] + [table.alias for table in tables[1:]], dtype=np.intp)
+        weights = np.array([[0.0] * 45] + [table.weights for table in tables[1:]])
+        totals = weights.sum(axis=1)
+        rows = np.arange(n)
+        
+        chosen = np.empty((n, 6), dtype=np.intp)
+        chosen[:, 0] = self.pattern_sampler.sample_batch(n, 1, rng)[:, 0]
+        seen = np.zeros((n, 46), dtype=bool)
+        seen[rows, chosen[:, 0]] = True
+        for j in range(1, 6):
+            # 행 합계 비례로 기준 번호를 고른 뒤 그 행의 별칭 테이블에서 추출
+            cum = totals[chosen[:, :j]].cumsum(axis=1)
+            u = rng.random(n) * cum[:, -1]
+            base = chosen[rows, np.minimum((cum <= u[:, None]).sum(axis=1), j - 1)]
+            r = rng.random(n) * 45
+            i = r.astype(np.intp)
+            num = np.where(r - i < prob[base, i], i, alias[base, i]) + 1
+            
+            hit = np.nonzero(seen[rows, num])[0]
+            if len(hit):
+                residual = weights[chosen[hit, :j]].sum(axis=1)
+                residual[seen[hit, 1:]] = 0
+                cum = residual.cumsum(axis=1)
+                u = rng.random(len(hit)) * cum[:, -1]
+                num[hit] = np.minimum((cum <= u[:, None]).sum(axis=1), 44) + 1
+            chosen[:, j] = num
+            seen[rows, num] = True
+        return chosen
+
+    def _batch_coverage(self, n, rng, pool=None, t=2, exclude=None):
+        """커버리지 조합 (배치) - 서로 다른 n 게임이 pool 의 t개 번호 조합을 최대한 고르게 덮도록"""
+        from LOTTO_WHEEL import coverage_tickets
+        return coverage_tickets(n, pool, t, rng, exclude=exclude)
+
+    def _batch_range_distribution(self, n, rng):
+        """숫자 범위 분포 (배치)"""
+        picked = self._partial_shuffle(3 * n, 15, 2, rng).reshape(n, 3, 2)
+        return (picked + np.array([1, 16, 31])[:, None]).reshape(n, 6)
@@ -0,0 +1,17 @@
+"""
+LOTTO_METHODS.py - 번호 생성 방법 목록
+numpy 등 무거운 의존성 없이 UI 가 바로 가져다 쓸 수 있도록 LOTTO_LOGIC 과 분리
+"""
+
+# 생성 방법 정의 - key 는 LottoLogic.generate_<key> / generate_batch(key)
+# set_level: 게임들을 한 세트로 함께 만드는 방법 (요청한 게임 수를 한 번의 배치로 생성해야 함)
+GENERATION_METHODS = [
+    {"name": "기본 랜덤", "key": "random", "data_required": False},
+    {"name": "패턴 분석 (자주)", "key": "pattern", "data_required": True},
+    {"name": "핫/콜드 조합", "key": "hot_cold_mix", "data_required": True},
+    {"name": "홀수/짝수 균형", "key": "balance", "data_required": False},
+    {"name": "숫자 범위 분포", "key": "range_distribution", "data_required": False},
+    {"name": "합계 구간", "key": "sum_window", "data_required": True},
+    {"name": "동반 출현", "key": "cooccurrence", "data_required": True},
+    {"name": "커버리지 조합 (휠링)", "key": "coverage", "data_required": False, "set_level": True},
+]
@@ -0,0 +1,204 @@
+"""
+LOTTO_METRICS.py - 구간 시간/카운터 계측
+꺼져 있으면 timer() 는 공용 빈 컨텍스트만 돌려주고 timed() 는 플래그 확인 후 바로 원 함수 호출
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+METRICS_FILE = "metrics.log"
+METRICS_FLAG = "metrics_enabled"   # 앱 저장소에 이 파일이 있으면 계측 켜짐 (내용이 overlay 면 오버레이도)
+MAX_BYTES = 256 * 1024
+BACKUP_COUNT = 3
+RECENT_SIZE = 200
+
+_enabled = False
+_logger = None
+_lock = threading.Lock()
+_recent = deque(maxlen=RECENT_SIZE)
+_last = {}
+_counters = {}
+
+class _NullTimer:
+    """계측 꺼짐 - 아무것도 하지 않는 공용 컨텍스트"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        fields = self.fields
+        if exc_type is not None:
+            fields = dict(fields, error=exc_type.__name__)
+        record(self.name, time.perf_counter() - self.start, **fields)
+        return False
+
+def enabled():
+    return _enabled
+
+def enable(directory=None):
+    """계측 켜기 - directory 가 있으면 그 안의 회전 파일에 JSON 줄로 기록"""
+    global _enabled, _logger
+    if directory is not None and _logger is None:
+        handler = logging.handlers.RotatingFileHandler(
+            os.path.join(directory, METRICS_FILE), maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = logging.getLogger("lotto.metrics")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        _logger = logger
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def configure_from(directory):
+    """환경변수 LOTTO_METRICS 또는 저장소의 플래그 파일로 계측 설정, 오버레이 사용 여부 반환"""
+    mode = os.environ.get("LOTTO_METRICS", "")
+    flag = os.path.join(directory, METRICS_FLAG)
+    if not mode and os.path.exists(flag):
+        with open(flag, encoding="utf-8") as f:
+            mode = f.read().strip() or "1"
+    if mode and mode != "0":
+        enable(directory)
+    return _enabled and mode == "overlay"
+
+def record(name, seconds, **fields):
+    """측정값 하나 기록 (최근 목록 + 파일)"""
+    if not _enabled:
+        return
+    entry = {"t": round(time.time(), 3), "name": name, "ms": round(seconds * 1000, 3)}
+    entry.update(fields)
+    with _lock:
+        _recent.append(entry)
+        _last[name] = entry
+    if _logger is not None:
+        _logger.info(json.dumps(entry, ensure_ascii=False))
+
+def timer(name, **fields):
+    """with timer("이름"): ... 구간 시간 기록"""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name, fields)
+
+def timed(name):
+    """함수 호출 시간 기록 데코레이터"""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Timer(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def count(name, n=1):
+    """카운터 증가"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+def recent(limit=None):
+    """최근 기록 (오래된 것부터)"""
+    with _lock:
+        items = list(_recent)
+    return items if limit is None else items[-limit:]
+
+def snapshot():
+    """이름별 마지막 측정값과 카운터"""
+    with _lock:
+        return {"last": dict(_last), "counters": dict(_counters)}
+
+def summary(names=None):
+    """오버레이용 한 줄 요약 - '이름 12.3ms · ...'"""
+    with _lock:
+        last = dict(_last)
+    names = names or sorted(last, key=lambda name: last[name]["t"], reverse=True)[:4]
+    return " · ".join(f"{name} {last[name]['ms']:.0f}ms" for name in names if name in last)
+
+class ImportProfiler:
+    """import 문마다 걸린 시간 측정 (시작 시간 분석용) - builtins.__import__ 를 잠시 교체"""
+
+    def __init__(self):
+        self.stats = {}  # 모듈 -> [누적, 자체] 초
+        self._local = threading.local()
+        self._original = None
+
+    def start(self):
+        import builtins
+        self._original = original = builtins.__import__
+        stats, local = self.stats, self._local
+        loaded = sys.modules
+
+        def profiled_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level == 0 and name in loaded:
+                return original(name, globals, locals, fromlist, level)
+            stack = getattr(local, "stack", None)
+            if stack is None:
+                stack = local.stack = []
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                if level:
+                    # 상대 import 는 패키지 이름을 붙여 표시
+                    package = (globals or {}).get("__package__") or ""
+                    name = f"{package}.{name}" if name else package
+                with _lock:
+                    entry = stats.setdefault(name, [0.0, 0.0])
+                    entry[0] += elapsed
+                    entry[1] += elapsed - children
+
+        builtins.__import__ = profiled_import
+        return self
+
+    def stop(self):
+        import builtins
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def top(self, limit=20, key=0):
+        """누적(key=0) 또는 자체(key=1) 시간 상위 모듈 [(모듈, 누적, 자체)]"""
+        with _lock:
+            items = [(name, total, own) for name, (total, own) in self.stats.items()]
+        items.sort(key=lambda item: item[1 + key], reverse=True)
+        return items[:limit]
+
+    def report(self, limit=20, out=None):
+        """상위 모듈 표 출력 + 계측 기록"""
+        out = out or sys.stderr
+        print(f"{'누적 ms':>10} {'자체 ms':>10}  모듈", file=out)
+        for name, total, own in self.top(limit):
+            print(f"{total * 1000:10.1f} {own * 1000:10.1f}  {name}", file=out)
+            record(f"import.{name}", total, own_ms=round(own * 1000, 3))
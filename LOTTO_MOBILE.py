@@ -1,236 +1,128 @@
 """
 LOTTO_MOBILE.py - 안드로이드용 로또 번호 생성기
 Kivy/KivyMD 기반 모바일 앱
+
+시작 시간 단축을 위해 첫 화면에 필요한 모듈만 가져오고,
+분석(LOTTO_LOGIC, numpy)과 데이터 계층(LOTTO_DATA, requests)은 작업 스레드에서,
+다이얼로그/메뉴는 처음 열 때 가져옴
 """
 
-import random
+import os
 import time
-import requests
-from collections import Counter
-import base64
 import threading
-from datetime import datetime
+from collections import deque
+
+from LOTTO_METHODS import GENERATION_METHODS
+from LOTTO_BALLS import BallTextures, TexturedBall
+import LOTTO_METRICS as metrics
 
 # Kivy imports
-from kivy.app import App
-from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
-from kivy.uix.label import Label
-from kivy.uix.button import Button
-from kivy.uix.spinner import Spinner
-from kivy.uix.popup import Popup
-from kivy.uix.progressbar import ProgressBar
-from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.properties import NumericProperty, ListProperty
 from kivy.clock import Clock
 from kivy.metrics import dp
-from kivy.core.window import Window
 
 # KivyMD imports
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.gridlayout import MDGridLayout
-from kivymd.uix.button import MDRaisedButton, MDIconButton, MDFlatButton
+from kivymd.uix.button import MDRaisedButton
 from kivymd.uix.label import MDLabel
 from kivymd.uix.card import MDCard
-from kivymd.uix.dialog import MDDialog
-from kivymd.uix.selectioncontrol import MDSpinner
-from kivymd.uix.toolbar import MDTopAppBar
 from kivymd.uix.progressbar import MDProgressBar
-from kivymd.uix.menu import MDDropdownMenu
-from kivymd.uix.list import OneLineListItem
-from kivymd.theming import ThemableBehavior
 
-try:
-    from supabase import create_client, Client
-    from bs4 import BeautifulSoup
-except ImportError:
-    # 모바일에서 누락된 라이브러리 처리
-    BeautifulSoup = None
-    Client = None
+# 결과 표시
+GAME_CARD_HEIGHT = dp(120)
+GAME_COUNTS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 20, 50, 100, 500, 1000]
 
-# --- Configuration ---
-_SB_URL = "aHR0cHM6Ly9uaXd0enZ3Y29kbW1qdm54Ynp4Zi5zdXBhYmFzZS5jbw=="
-_SB_KEY = "ZXlKaGJHY2lPaUpJVXpJMU5pSXNJblI1Y0NJNklrcFhWQ0o5LmV5SnBjM01pT2lKemRYQmhZbUZ6WlNJc0luSmxaaUk2SW01cGQzUjZkbmRqYjJSdGJXcDJibmhpZW5obUlpd2ljbTlzWlNJNkltRnViMjRpTENKcFlYUWlPakUzTlRFM056VTVORGdzSW1WNGNDaTZNakEyTnpNMU1UazBPSDAuTnQ1dHN1ZHc4aXBJcEFqbkYwNDV2T0VnTms2Uk5mV0dzOHFCTmRSMlk2bw=="
+# 번호 생성 (작업 스레드 -> 프레임 단위 표시)
+GENERATE_TEXT = "🎲 번호 생성"
+CANCEL_TEXT = "⏹ 생성 취소"
+GENERATE_CHUNK = 200     # 작업 스레드가 한 번에 만드는 게임 수
+BATCH_MIN = 50           # 이 이상이면 배치 생성 사용
+FRAME_BUDGET = 0.008     # 프레임당 결과 반영에 쓰는 최대 시간 (초)
+DRAIN_PER_FRAME = 100    # 프레임당 최대 추가 게임 수
 
-def _decode_config():
-    """설정 디코딩"""
-    try:
-        url = base64.b64decode(_SB_URL).decode()
-        key = base64.b64decode(_SB_KEY).decode()
-        return url, key
-    except:
-        return None, None
-
-SUPABASE_URL, SUPABASE_KEY = _decode_config()
-BASE_URL = "https://www.dhlottery.co.kr/gameResult.do?method=byWin&drwNo={}"
+# 계측 오버레이 갱신 주기 (초)
+METRICS_OVERLAY_INTERVAL = 1.0
 
 # Global variables
 supabase = None
-past_winnings = []
 
+@metrics.timed("init_supabase")
 def init_supabase():
-    """Supabase 초기화"""
+    """Supabase 초기화 (REST 전송 생성)"""
     global supabase
+    from LOTTO_DATA import SUPABASE_URL, SUPABASE_KEY, PostgrestTransport
+    
     if SUPABASE_URL and SUPABASE_KEY:
         try:
-            supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+            supabase = PostgrestTransport(SUPABASE_URL, SUPABASE_KEY)
             return True
         except Exception as e:
+            metrics.count("supabase.error")
             print(f"Supabase 연결 오류: {e}")
             return False
     return False
 
-def load_lotto_data():
-    """Supabase에서 로또 데이터 로드"""
-    global past_winnings
+@metrics.timed("load_lotto_data")
+def load_lotto_data(cache):
+    """로또 데이터 로드 - cache(LOTTO_DATA.DrawCache) 이후 회차만 페이지 단위로 병렬 요청해 cache 에 추가"""
+    from LOTTO_DATA import fetch_draws_paged
+    
     if not supabase:
+        if len(cache):
+            return True, f"오프라인: 캐시에서 {len(cache)}개 회차 로드"
         return False, "데이터베이스 연결 실패"
     
     try:
-        response = supabase.table('lotto_data').select('num1, num2, num3, num4, num5, num6').order('round').execute()
-        
-        if response.data:
-            past_winnings = []
-            for row in response.data:
-                numbers = [row['num1'], row['num2'], row['num3'], row['num4'], row['num5'], row['num6']]
-                if all(1 <= x <= 45 for x in numbers) and len(set(numbers)) == 6:
-                    past_winnings.append(sorted(numbers))
-            
-            return True, f"총 {len(past_winnings)}개 회차 로드 완료"
+        fetch_draws_paged(supabase, cache)
+        if len(cache):
+            return True, f"총 {len(cache)}개 회차 로드 완료"
         else:
             return False, "데이터가 없습니다"
     except Exception as e:
+        metrics.count("load.error")
+        # 실패 전까지 받은 페이지는 캐시에 이미 반영됨
+        if len(cache):
+            return True, f"오프라인: 캐시에서 {len(cache)}개 회차 로드"
         return False, f"데이터 로드 오류: {e}"
 
-class LottoLogic:
-    """로또 번호 생성 로직"""
-    
-    def __init__(self, past_winnings=None):
-        self.past_winnings = past_winnings if past_winnings is not None else []
-        self._patterns_analyzed = False
-        if self.past_winnings:
-            self.all_numbers_flat = [num for game in self.past_winnings for num in game]
-            self.number_freq = Counter(self.all_numbers_flat)
-            self._analyze_patterns()
-        else:
-            self.all_numbers_flat, self.number_freq = [], Counter()
-            self.hot_numbers, self.cold_numbers = [], []
-            self.sum_stats = {'min': 111, 'max': 170, 'avg': 140}
-
-    def _analyze_patterns(self):
-        """패턴 분석"""
-        if not self.past_winnings or self._patterns_analyzed: 
-            return
-        
-        avg_freq = sum(self.number_freq.values()) / len(self.number_freq) if self.number_freq else 0
-        self.hot_numbers = sorted([num for num, freq in self.number_freq.items() if freq > avg_freq], 
-                                 key=self.number_freq.get, reverse=True)
-        self.cold_numbers = sorted([num for num in range(1, 46) if self.number_freq.get(num, 0) < avg_freq], 
-                                  key=lambda num: self.number_freq.get(num, 0))
-        
-        sums = [sum(g) for g in self.past_winnings]
-        self.sum_stats = {'min': min(sums), 'max': max(sums), 'avg': sum(sums) / len(sums)}
-        self._patterns_analyzed = True
-
-    def generate_random(self):
-        """기본 랜덤"""
-        return sorted(random.sample(range(1, 46), 6))
-
-    def generate_pattern(self):
-        """패턴 분석 (자주 나온 번호)"""
-        if not self.past_winnings: 
-            return self.generate_random()
-        
-        population = list(self.number_freq.keys())
-        weights = list(self.number_freq.values())
-        if not population: 
-            return self.generate_random()
-        
-        numbers = set()
-        while len(numbers) < 6:
-            numbers.add(random.choices(population, weights=weights, k=1)[0])
-        return sorted(list(numbers))
-
-    def generate_hot_cold_mix(self):
-        """핫/콜드 번호 조합"""
-        if not self.past_winnings:
-            return self.generate_random()
-        
-        numbers = set()
-        if self.hot_numbers:
-            numbers.update(random.sample(self.hot_numbers, min(3, len(self.hot_numbers))))
-        if self.cold_numbers:
-            numbers.update(random.sample(self.cold_numbers, min(3, len(self.cold_numbers))))
-        
-        while len(numbers) < 6:
-            numbers.add(random.randint(1, 45))
-        
-        return sorted(random.sample(list(numbers), 6))
-
-    def generate_balance(self):
-        """홀수/짝수 균형"""
-        for _ in range(100):
-            numbers = random.sample(range(1, 46), 6)
-            if 2 <= sum(1 for x in numbers if x % 2) <= 4:
-                return sorted(numbers)
-        return self.generate_random()
+def get_color_for_number(number):
+    """번호에 따른 색상 반환"""
+    if 1 <= number <= 10:
+        return (1, 0.77, 0, 1)  # 노란색
+    elif 11 <= number <= 20:
+        return (0.41, 0.78, 0.95, 1)  # 파란색
+    elif 21 <= number <= 30:
+        return (1, 0.45, 0.45, 1)  # 빨간색
+    elif 31 <= number <= 40:
+        return (0.67, 0.67, 0.67, 1)  # 회색
+    elif 41 <= number <= 45:
+        return (0.69, 0.83, 0.25, 1)  # 초록색
+    else:
+        return (0.5, 0.5, 0.5, 1)  # 기본색
 
-    def generate_range_distribution(self):
-        """숫자 범위 분포"""
-        try:
-            numbers = set()
-            for start, end in [(1, 15), (16, 30), (31, 45)]:
-                numbers.update(random.sample(range(start, end + 1), 2))
-            while len(numbers) < 6:
-                numbers.add(random.randint(1, 45))
-            return sorted(random.sample(list(numbers), 6))
-        except:
-            return self.generate_random()
-
-class LottoBall(MDCard):
-    """로또 공 위젯"""
+class LottoBall(TexturedBall):
+    """로또 공 위젯 (번호별로 한 번만 그린 텍스처 사용)"""
+    
+    textures = BallTextures(get_color_for_number)
+    get_color_for_number = staticmethod(get_color_for_number)
     
     def __init__(self, number=0, **kwargs):
-        super().__init__(**kwargs)
-        self.number = number
-        self.md_bg_color = self.get_color_for_number(number)
+        super().__init__(number, **kwargs)
         self.size_hint = (None, None)
         self.size = (dp(60), dp(60))
-        self.radius = [dp(30)]
-        self.elevation = 3
-        
-        # 번호 라벨
-        label = MDLabel(
-            text=str(number),
-            halign="center",
-            valign="center",
-            theme_text_color="Custom",
-            text_color=(1, 1, 1, 1),
-            font_style="H6",
-            bold=True
-        )
-        self.add_widget(label)
-    
-    def get_color_for_number(self, number):
-        """번호에 따른 색상 반환"""
-        if 1 <= number <= 10:
-            return (1, 0.77, 0, 1)  # 노란색
-        elif 11 <= number <= 20:
-            return (0.41, 0.78, 0.95, 1)  # 파란색
-        elif 21 <= number <= 30:
-            return (1, 0.45, 0.45, 1)  # 빨간색
-        elif 31 <= number <= 40:
-            return (0.67, 0.67, 0.67, 1)  # 회색
-        elif 41 <= number <= 45:
-            return (0.69, 0.83, 0.25, 1)  # 초록색
-        else:
-            return (0.5, 0.5, 0.5, 1)  # 기본색
 
 class GameCard(MDCard):
-    """게임 카드 위젯"""
+    """게임 카드 위젯 - RecycleView 가 data 의 game_number/numbers 를 바꿔가며 재사용"""
+    
+    game_number = NumericProperty(0)
+    numbers = ListProperty([])
     
-    def __init__(self, game_number, numbers, **kwargs):
+    def __init__(self, game_number=0, numbers=(), **kwargs):
         super().__init__(**kwargs)
         self.md_bg_color = (0.16, 0.16, 0.19, 1)
         self.padding = dp(15)
@@ -238,20 +130,19 @@ class GameCard(MDCard):
         self.radius = [dp(15)]
         self.elevation = 2
         self.size_hint_y = None
-        self.height = dp(120)
+        self.height = GAME_CARD_HEIGHT
         
         layout = MDBoxLayout(orientation='vertical', spacing=dp(10))
         
         # 게임 번호 라벨
-        game_label = MDLabel(
-            text=f"Game {game_number}",
+        self.game_label = MDLabel(
             theme_text_color="Custom",
             text_color=(0.7, 0.7, 0.9, 1),
             size_hint_y=None,
             height=dp(30),
             font_style="Subtitle1"
         )
-        layout.add_widget(game_label)
+        layout.add_widget(self.game_label)
         
         # 번호 레이아웃
         numbers_layout = MDGridLayout(
@@ -262,33 +153,80 @@ class GameCard(MDCard):
             adaptive_width=True
         )
         
-        for number in numbers:
-            ball = LottoBall(number)
+        self.balls = [LottoBall() for _ in range(6)]
+        for ball in self.balls:
             numbers_layout.add_widget(ball)
         
         layout.add_widget(numbers_layout)
         self.add_widget(layout)
+        
+        self.game_number = game_number
+        self.numbers = list(numbers)
+        self.on_game_number(self, self.game_number)
+    
+    def on_game_number(self, instance, value):
+        self.game_label.text = f"Game {value}"
+    
+    def on_numbers(self, instance, value):
+        for ball, number in zip(self.balls, value):
+            ball.set_number(number)
+
+class GenerationRun:
+    """진행 중인 번호 생성 작업 (작업 스레드가 queue 에 넣고 메인 스레드가 꺼내 표시)"""
+    
+    def __init__(self, total):
+        self.total = total
+        self.cancel = threading.Event()
+        self.queue = deque()
+        self.done = False
+        self.shown = 0
+        self.started = time.perf_counter()
+
+def generate_chunk(logic, key, size, batch=False):
+    """size 게임 생성 - 큰 묶음(또는 batch)은 배치 생성, 잘못된 결과나 오류는 랜덤으로 대체"""
+    with metrics.timer(f"strategy.{key}", n=size):
+        return _generate_chunk(logic, key, size, batch)
+
+def _generate_chunk(logic, key, size, batch):
+    if batch or size >= BATCH_MIN:
+        try:
+            return logic.generate_batch(key, size).tolist()
+        except Exception:
+            # numpy 없음 등 - 한 게임씩 생성
+            pass
+    
+    generate = getattr(logic, f"generate_{key}")
+    rows = []
+    for _ in range(size):
+        try:
+            numbers = generate()
+            if not (isinstance(numbers, list) and len(numbers) == 6):
+                # 실패시 랜덤 생성
+                numbers = logic.generate_random()
+        except Exception:
+            # 오류시 랜덤 생성
+            numbers = logic.generate_random()
+        rows.append(numbers)
+    return rows
 
 class LottoMobileApp(MDApp):
     """메인 앱 클래스"""
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.logic = LottoLogic()
+        self.logic = None  # 작업 스레드에서 분석 모듈을 불러온 뒤 생성
         self.connected = False
         self.dialog = None
+        self.cache = None
+        self.tickets = None  # 생성한 게임 기록 (LOTTO_TICKETS.TicketStore)
+        self.updating = False
         
-        # 생성 방법 정의
-        self.generation_methods = [
-            {"name": "기본 랜덤", "method": self.logic.generate_random, "data_required": False},
-            {"name": "패턴 분석 (자주)", "method": self.logic.generate_pattern, "data_required": True},
-            {"name": "핫/콜드 조합", "method": self.logic.generate_hot_cold_mix, "data_required": True},
-            {"name": "홀수/짝수 균형", "method": self.logic.generate_balance, "data_required": False},
-            {"name": "숫자 범위 분포", "method": self.logic.generate_range_distribution, "data_required": False},
-        ]
+        # 생성 방법 정의 (self.logic 이 교체되어도 항상 현재 로직을 사용)
+        self.generation_methods = [dict(method) for method in GENERATION_METHODS]
         
         self.current_method = 0
         self.current_games = 5
+        self.generation = None
 
     def build(self):
         """앱 UI 구성"""
@@ -328,6 +266,23 @@ class LottoMobileApp(MDApp):
         )
         main_layout.add_widget(self.status_label)
         
+        # 계측 오버레이 (켜져 있을 때만)
+        if metrics.configure_from(self.user_data_dir):
+            self.metrics_label = MDLabel(
+                text="",
+                halign="center",
+                theme_text_color="Hint",
+                size_hint_y=None,
+                height=dp(20),
+                font_style="Overline"
+            )
+            main_layout.add_widget(self.metrics_label)
+            Clock.schedule_interval(self.update_metrics_overlay, METRICS_OVERLAY_INTERVAL)
+        
+        # 생성 진행률 (생성 중에만 표시)
+        self.progress_bar = MDProgressBar(value=0, size_hint_y=None, height=dp(4), opacity=0)
+        main_layout.add_widget(self.progress_bar)
+        
         # 컨트롤 카드
         controls_card = MDCard(
             md_bg_color=(0.16, 0.16, 0.21, 1),
@@ -377,7 +332,7 @@ class LottoMobileApp(MDApp):
         button_layout.add_widget(self.update_button)
         
         self.generate_button = MDRaisedButton(
-            text="🎲 번호 생성",
+            text=GENERATE_TEXT,
             md_bg_color=(0, 0.9, 0.46, 1),
             size_hint_x=0.5
         )
@@ -388,36 +343,90 @@ class LottoMobileApp(MDApp):
         controls_card.add_widget(controls_layout)
         main_layout.add_widget(controls_card)
         
-        # 결과 스크롤 영역
-        self.results_scroll = ScrollView()
-        self.results_layout = MDBoxLayout(
+        # 결과 목록 (보이는 행만 GameCard 를 만들어 재사용)
+        self.results_view = RecycleView(viewclass=GameCard)
+        self.results_layout = RecycleBoxLayout(
             orientation='vertical',
             spacing=dp(10),
-            adaptive_height=True
+            default_size=(None, GAME_CARD_HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None
         )
-        self.results_scroll.add_widget(self.results_layout)
-        main_layout.add_widget(self.results_scroll)
+        self.results_layout.bind(minimum_height=self.results_layout.setter('height'))
+        self.results_view.add_widget(self.results_layout)
+        main_layout.add_widget(self.results_view)
         
         screen.add_widget(main_layout)
         
-        # 데이터베이스 연결 시도
-        Clock.schedule_once(self.connect_database, 1)
-        
         return screen
     
+    def on_start(self):
+        """첫 프레임 직후 데이터베이스 연결 시작"""
+        Clock.schedule_once(self.connect_database, 0)
+    
     def connect_database(self, dt):
-        """데이터베이스 연결"""
+        """데이터베이스 연결 - 분석/네트워크 모듈은 이 작업 스레드에서 처음 가져옴"""
         def connect():
-            if init_supabase():
-                success, message = load_lotto_data()
-                if success:
-                    self.connected = True
-                    Clock.schedule_once(lambda dt: self.update_status(f"✅ {message}"), 0)
-                    self.logic = LottoLogic(past_winnings)
-                else:
-                    Clock.schedule_once(lambda dt: self.update_status(f"⚠️ {message}"), 0)
+            with metrics.timer("import.data_layer"):
+                from LOTTO_LOGIC import LottoLogic
+                from LOTTO_DATA import CACHE_FILE, DrawCache
+                from LOTTO_SNAPSHOT import load_snapshot
+                from LOTTO_TICKETS import TICKETS_FILE, TicketStore
+            
+            # 번들 스냅샷으로 먼저 시작 - 데이터가 필요한 생성 방법도 바로 사용 가능
+            snapshot = load_snapshot()
+            if snapshot is not None and len(snapshot):
+                with metrics.timer("snapshot_load", rounds=len(snapshot)):
+                    self.logic = LottoLogic.from_snapshot(snapshot)
+                self.connected = True
+                count = len(snapshot)
+                Clock.schedule_once(lambda dt: self.update_status(f"📦 저장된 {count}개 회차로 시작 - 최신 회차 확인 중..."), 0)
+            else:
+                snapshot = None
+            
+            cache = DrawCache(os.path.join(self.user_data_dir, CACHE_FILE))
+            if snapshot is not None:
+                # 캐시가 스냅샷보다 뒤처져 있으면 채워 두고 서버에는 이후 회차만 요청
+                cache.append(snapshot.rows())
+            online = init_supabase()
+            success, message = load_lotto_data(cache)
+            
+            if snapshot is not None:
+                # 스냅샷 이후 회차만 반영한 새 로직으로 교체 (진행 중인 생성은 이전 로직을 계속 사용)
+                newer = [numbers for round_no, numbers, bonus in cache.results() if round_no > snapshot.last_round]
+                if newer:
+                    with metrics.timer("logic_reconcile", rounds=len(newer)):
+                        logic = LottoLogic.from_snapshot(snapshot)
+                        logic.add_draws(newer)
+                    self.logic = logic
+                snapshot.close()
+            else:
+                with metrics.timer("logic_init", rounds=len(cache) if success else 0):
+                    self.logic = LottoLogic(cache.draws if success else [])
+            
+            # 지난 생성 기록을 받은 회차로 확인
+            try:
+                with metrics.timer("tickets_check"):
+                    tickets = TicketStore(os.path.join(self.user_data_dir, TICKETS_FILE))
+                    found = tickets.new_wins(tickets.check(cache.results()))
+                    tickets.mark_checked(cache.last_round)
+            except ImportError as e:
+                # 게임 기록 없이 계속 - 번호 생성은 그대로 사용 가능
+                message += f" · 게임 기록 비활성화 ({e})"
+            else:
+                self.tickets = tickets
+                if len(found):
+                    message += f" · 내 게임 {len(found)}개 당첨"
+            
+            if success:
+                self.connected = True
+                Clock.schedule_once(lambda dt: self.update_status(f"✅ {message}"), 0)
+            elif online:
+                Clock.schedule_once(lambda dt: self.update_status(f"⚠️ {message}"), 0)
             else:
                 Clock.schedule_once(lambda dt: self.update_status("❌ 데이터베이스 연결 실패"), 0)
+            # 로직 교체 후에 공개 - 업데이트는 이후부터 가능
+            self.cache = cache
         
         threading.Thread(target=connect, daemon=True).start()
     
@@ -425,8 +434,15 @@ class LottoMobileApp(MDApp):
         """상태 업데이트"""
         self.status_label.text = message
     
+    def update_metrics_overlay(self, dt):
+        """최근 측정값을 상태 레이블 아래에 표시"""
+        self.metrics_label.text = metrics.summary()
+    
     def show_method_menu(self, instance):
         """생성 방법 메뉴 표시"""
+        from kivymd.uix.menu import MDDropdownMenu
+        import kivymd.uix.list  # "OneLineListItem" viewclass 등록
+        
         menu_items = []
         for i, method in enumerate(self.generation_methods):
             item = {
@@ -451,8 +467,11 @@ class LottoMobileApp(MDApp):
     
     def show_games_menu(self, instance):
         """게임 수 메뉴 표시"""
+        from kivymd.uix.menu import MDDropdownMenu
+        import kivymd.uix.list  # "OneLineListItem" viewclass 등록
+        
         menu_items = []
-        for i in range(1, 11):
+        for i in GAME_COUNTS:
             item = {
                 "text": f"{i}게임",
                 "viewclass": "OneLineListItem", 
@@ -474,7 +493,15 @@ class LottoMobileApp(MDApp):
         self.games_menu.dismiss()
     
     def generate_numbers(self, instance):
-        """번호 생성"""
+        """번호 생성 - 작업 스레드에서 만들고 프레임마다 나눠 표시, 진행 중 다시 누르면 취소"""
+        if self.generation is not None:
+            self.cancel_generation()
+            return
+        
+        if self.logic is None:
+            self.show_dialog("준비 중", "번호 생성기를 준비하는 중입니다.\n잠시 후 다시 시도해주세요.")
+            return
+        
         method = self.generation_methods[self.current_method]
         
         # 데이터 필요한 방법인데 연결되지 않은 경우
@@ -483,37 +510,121 @@ class LottoMobileApp(MDApp):
             return
         
         # 기존 결과 지우기
-        self.results_layout.clear_widgets()
+        self.results_view.data = []
+        self.results_view.scroll_y = 1
+        
+        run = self.generation = GenerationRun(self.current_games)
+        logic, key = self.logic, method["key"]
+        tickets, last_round = self.tickets, self.cache.last_round if self.cache is not None else 0
+        # 세트 단위 방법은 게임들이 서로를 고려하므로 나누지 않고 한 번에 생성
+        set_level = method.get("set_level", False)
+        chunk = run.total if set_level else GENERATE_CHUNK
         
-        # 번호 생성 및 표시
-        for i in range(self.current_games):
+        def work():
             try:
-                numbers = method["method"]()
-                if isinstance(numbers, list) and len(numbers) == 6:
-                    game_card = GameCard(i + 1, numbers)
-                    self.results_layout.add_widget(game_card)
-                else:
-                    # 실패시 랜덤 생성
-                    numbers = self.logic.generate_random()
-                    game_card = GameCard(i + 1, numbers)
-                    self.results_layout.add_widget(game_card)
-            except Exception as e:
-                # 오류시 랜덤 생성
-                numbers = self.logic.generate_random()
-                game_card = GameCard(i + 1, numbers)
-                self.results_layout.add_widget(game_card)
+                from LOTTO_TICKETS import next_round
+                target = next_round(last_round)
+                game = 1
+                while game <= run.total and not run.cancel.is_set():
+                    size = min(chunk, run.total - game + 1)
+                    rows = generate_chunk(logic, key, size, batch=set_level)
+                    if run.cancel.is_set():
+                        # 취소한 뒤 끝난 조각은 보여주지도 기록하지도 않음
+                        break
+                    if tickets is not None:
+                        tickets.append(target, key, rows)
+                    run.queue.extend({"game_number": game + i, "numbers": numbers} for i, numbers in enumerate(rows))
+                    game += size
+            finally:
+                run.done = True
+        
+        self.progress_bar.value = 0
+        self.progress_bar.opacity = 1
+        self.generate_button.text = CANCEL_TEXT
+        threading.Thread(target=work, daemon=True).start()
+        Clock.schedule_interval(lambda dt: self.drain_generation(run), 0)
+    
+    def drain_generation(self, run):
+        """대기 중인 결과를 프레임 예산 안에서만 목록에 반영 (False 반환 시 스케줄 해제)"""
+        if run is not self.generation:
+            return False
+        
+        start = time.perf_counter()
+        items = []
+        while run.queue and len(items) < DRAIN_PER_FRAME and time.perf_counter() - start < FRAME_BUDGET:
+            items.append(run.queue.popleft())
+        if items:
+            self.results_view.data.extend(items)
+            run.shown += len(items)
+            self.progress_bar.value = 100 * run.shown / run.total
+            metrics.record("render.frame", time.perf_counter() - start, n=len(items))
+        
+        if run.done and not run.queue:
+            self.finish_generation()
+            return False
+    
+    def cancel_generation(self):
+        """진행 중인 생성 취소 - 이미 표시된 결과는 유지"""
+        run = self.generation
+        run.cancel.set()
+        self.finish_generation()
+        self.update_status(f"⏹ 생성 취소 ({run.shown}/{run.total}게임)")
+    
+    def finish_generation(self):
+        """생성 종료 후 버튼/진행률 복원"""
+        run = self.generation
+        metrics.record("generate_numbers", time.perf_counter() - run.started, n=run.shown, cancelled=run.cancel.is_set())
+        self.generation = None
+        self.generate_button.text = GENERATE_TEXT
+        self.progress_bar.opacity = 0
     
     def update_data(self, instance):
-        """데이터 업데이트"""
-        if not self.connected:
-            self.show_dialog("연결 오류", "데이터베이스에 연결할 수 없습니다.")
+        """데이터 업데이트 (동행복권 사이트에서 누락 회차 수집)"""
+        if self.cache is None:
+            self.show_dialog("연결 오류", "데이터를 불러오는 중입니다.\n잠시 후 다시 시도해주세요.")
+            return
+        if self.updating:
             return
         
-        # 업데이트 로직은 복잡하므로 간단히 처리
-        self.show_dialog("업데이트", "모바일에서는 자동 업데이트가 제한됩니다.\n웹 버전을 사용해 데이터를 업데이트해주세요.")
+        self.updating = True
+        self.update_status("🔄 누락 회차 수집 중...")
+        
+        def update():
+            from LOTTO_DATA import update_draws
+            
+            try:
+                added = update_draws(self.cache)
+                # 진행 중인 생성이 쓰는 로직은 건드리지 않고 새 로직을 여기서 만든 뒤 메인 스레드에서 교체
+                logic = self.logic.with_draws(added) if added else self.logic
+            except Exception as e:
+                Clock.schedule_once(lambda dt: self.update_status(f"⚠️ 업데이트 오류: {e}"), 0)
+            else:
+                Clock.schedule_once(lambda dt: self.apply_update(added, logic), 0)
+            finally:
+                self.updating = False
+        
+        threading.Thread(target=update, daemon=True).start()
+    
+    def apply_update(self, added, logic):
+        """수집한 회차 반영 (메인 스레드) - 작업 스레드에서 만든 로직으로 참조만 교체"""
+        if added:
+            self.logic = logic
+            self.connected = True
+            message = f"✅ {len(added)}개 회차 추가 (총 {len(logic.draw_masks)}개)"
+            if self.tickets is not None:
+                found = self.tickets.new_wins(self.tickets.check(self.cache.results(len(self.cache) - len(added))))
+                self.tickets.mark_checked(self.cache.last_round)
+                if len(found):
+                    message += f" · 내 게임 {len(found)}개 당첨"
+            self.update_status(message)
+        else:
+            self.update_status("✅ 이미 최신 데이터입니다")
     
     def show_dialog(self, title, text):
         """다이얼로그 표시"""
+        from kivymd.uix.dialog import MDDialog
+        from kivymd.uix.button import MDFlatButton
+        
         if self.dialog:
             self.dialog.dismiss()
         
@@ -0,0 +1,224 @@
+"""
+LOTTO_ODDS.py - 게임 세트의 정확한 당첨 확률 계산 (가능한 추첨 8,145,060개 전체 기준)
+
+게임마다 3개 이상 일치하는 추첨(게임당 194,130개)만 비트마스크로 만들어 조합 순위를 구하고
+추첨별 일치 플래그 배열에 표시한 뒤, 8,145,060개 추첨 전체의 플래그 분포를 집계
+(보너스 번호는 추첨 번호를 뺀 39개 중 균등 - 5개 일치 게임의 나머지 번호 종류 수로 2/3등 분리)
+"""
+
+import functools
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+TOTAL_DRAWS = math.comb(45, 6)
+BONUS_CHOICES = 39
+TIERS = ("1등", "2등", "3등", "4등", "5등")
+NO_PRIZE = "낙첨"
+PARALLEL_MIN = 64  # 이보다 적은 게임은 프로세스 풀 없이 계산
+
+_LIMB = 15
+_LIMB_MASK = (1 << _LIMB) - 1
+
+@functools.lru_cache(maxsize=None)
+def _tables():
+    """조합 순위 표 - rank(마스크) = sum C(번호 위치, 아래 번호 수 + 1) 를 15비트 조각 3개로 나눠 조회
+
+    low[v] = 아래 조각 기여 << 3 | 번호 수, mid[b << 15 | v] = 가운데 조각 기여 << 3 | 누적 번호 수,
+    high[b << 15 | v] = 위 조각 기여 (b = 아래 조각들의 번호 수)
+    """
+    size = 1 << _LIMB
+    values = np.arange(size)
+    bits = (values[:, None] >> np.arange(_LIMB)) & 1
+    below = np.cumsum(bits, axis=1) - bits
+    count = bits.sum(axis=1)
+    comb = np.array([[math.comb(n, r) for r in range(8)] for n in range(45)], dtype=np.int64)
+    parts = np.zeros((3, 7, size), dtype=np.int64)
+    for limb in range(3):
+        positions = limb * _LIMB + np.arange(_LIMB)
+        for before in range(7):
+            r = np.minimum(before + below + 1, 7)
+            parts[limb, before] = (bits * comb[positions[None, :], r]).sum(axis=1)
+    low = (parts[0, 0] << 3) | count
+    mid = (parts[1] << 3) | np.minimum(np.arange(7)[:, None] + count[None, :], 7)
+    tables = (low.astype(np.int32), mid.reshape(-1).astype(np.int32), parts[2].reshape(-1).astype(np.int32))
+
+    subsets = {}
+    for k in range(3, 7):
+        outer = list(itertools.combinations(range(39), 6 - k))
+        subsets[k] = (np.array(list(itertools.combinations(range(6), k)), dtype=np.intp),
+                      np.array(outer, dtype=np.intp).reshape(len(outer), 6 - k))
+    return tables, subsets
+
+def _limbs(masks):
+    masks = np.asarray(masks, dtype=np.int64)
+    return [((masks >> (_LIMB * i)) & _LIMB_MASK).astype(np.int32) for i in range(3)]
+
+def _rank_limbs(low, mid, high):
+    low_table, mid_table, high_table = _tables()[0]
+    a = low_table[low]
+    b = mid_table[((a & 7) << _LIMB) | mid]
+    rank = (a >> 3) + (b >> 3)
+    rank += high_table[((b & 7) << _LIMB) | high]
+    return rank
+
+def draw_rank(masks):
+    """6개 번호 마스크 -> 0 <= 순위 < 8,145,060 (조합수 체계 순위)"""
+    return _rank_limbs(*_limbs(masks))
+
+_NUMBER_BITS = 1 << np.arange(45, dtype=np.int64)
+
+def _evaluate(tickets):
+    """게임 목록 -> (k개 일치 게임이 있는 추첨 플래그 {k: 비트 압축 배열}, 5개 일치 추첨 순위, 그 추첨에 없는 게임의 나머지 번호)"""
+    subsets = _tables()[1]
+    flags = {k: np.zeros(TOTAL_DRAWS, dtype=bool) for k in subsets}
+    fives, extras = [], []
+    everything = np.arange(45)
+    for ticket in tickets:
+        inside = np.asarray(ticket, dtype=np.intp) - 1
+        outside = np.setdiff1d(everything, inside)
+        for k, (inner, outer) in subsets.items():
+            # 게임에서 k개 x 나머지 39개에서 6-k개 - 조각별로 OR 해서 64비트 연산 없이 순위 계산
+            picked = _limbs(_NUMBER_BITS[inside[inner]].sum(axis=1))
+            rest = _limbs(_NUMBER_BITS[outside[outer]].sum(axis=1))
+            ranks = _rank_limbs(*(p[:, None] | r[None, :] for p, r in zip(picked, rest))).ravel()
+            flags[k][ranks] = True
+            if k == 5:
+                # inner 행마다 빠진 게임 번호 하나 - 보너스가 이 번호면 2등
+                leftover = inside[15 - inner.sum(axis=1)]
+                fives.append(ranks)
+                extras.append(np.repeat(leftover, len(outer)))
+    packed = {k: np.packbits(flag) for k, flag in flags.items()}
+    if fives:
+        return packed, np.concatenate(fives), np.concatenate(extras)
+    return packed, np.empty(0, dtype=np.int32), np.empty(0, dtype=np.intp)
+
+def _present(flags):
+    """{k: 비트 압축 플래그} -> 추첨별 일치 개수 비트 (1 << k)"""
+    present = np.zeros(TOTAL_DRAWS, dtype=np.uint8)
+    for k, packed in flags.items():
+        present |= np.unpackbits(packed, count=TOTAL_DRAWS) << np.uint8(k)
+    return present
+
+def ticket_odds(tickets, workers=None):
+    """게임 세트의 정확한 당첨 확률 - 모든 추첨(과 보너스 번호)이 같은 확률이라고 보고 계산
+
+    반환: {"tickets", "draws",
+           "at_least": {k: 어떤 게임이든 k개 이상 일치할 확률},
+           "tiers": {등수: {"any": 그 등수 당첨 게임이 하나 이상일 확률, "expected": 기대 당첨 게임 수}},
+           "best": {등수 또는 낙첨: 세트의 최고 등수 분포},
+           "coverage": {t: (덮인 t개 번호 조합 수, 전체 수)}}
+    """
+    tickets = [sorted(int(num) for num in ticket) for ticket in tickets]
+    for ticket in tickets:
+        if len(set(ticket)) != 6 or not all(1 <= num <= 45 for num in ticket):
+            raise ValueError(f"잘못된 게임: {ticket}")
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tickets) < PARALLEL_MIN:
+        flags, fives, extras = _evaluate(tickets)
+    else:
+        parts = [tickets[i::workers] for i in range(workers)]
+        flags, fives, extras = {}, [], []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part_flags, part_fives, part_extras in pool.map(_evaluate, parts):
+                for k, packed in part_flags.items():
+                    flags[k] = flags[k] | packed if k in flags else packed
+                fives.append(part_fives)
+                extras.append(part_extras)
+        fives, extras = np.concatenate(fives), np.concatenate(extras)
+    present = _present(flags)
+
+    # 5개 일치 추첨마다 게임들의 나머지 번호 종류 수 - 보너스가 그중 하나면 2등
+    draws5, kinds = np.unique(np.unique(fives.astype(np.int64) * 64 + extras) >> 6, return_counts=True)
+    hist = np.bincount(present, minlength=128)
+
+    def draws_where(test):
+        return int(sum(hist[value] for value in range(128) if hist[value] and test(value)))
+
+    second_any = kinds.sum() / BONUS_CHOICES
+    alone = ((present[draws5] & 64) == 0)  # 1등이 없는 5개 일치 추첨
+    second_best = kinds[alone].sum() / BONUS_CHOICES
+    any_counts = {
+        "1등": draws_where(lambda v: v & 64),
+        "2등": second_any,
+        "3등": draws_where(lambda v: v & 32) - np.count_nonzero(kinds == 1) / BONUS_CHOICES,
+        "4등": draws_where(lambda v: v & 16),
+        "5등": draws_where(lambda v: v & 8),
+    }
+    best_counts = {
+        "1등": any_counts["1등"],
+        "2등": second_best,
+        "3등": np.count_nonzero(alone) - second_best,
+        "4등": draws_where(lambda v: v & 16 and not v & 96),
+        "5등": draws_where(lambda v: v & 8 and not v & 112),
+    }
+    best_counts[NO_PRIZE] = draws_where(lambda v: not v & 120)
+
+    # 기대 당첨 수는 게임마다 같은 초기하 분포의 합
+    n = len(tickets)
+    per_match = {k: math.comb(6, k) * math.comb(39, 6 - k) / TOTAL_DRAWS for k in range(3, 7)}
+    expected = {
+        "1등": n * per_match[6],
+        "2등": n * per_match[5] / BONUS_CHOICES,
+        "3등": n * per_match[5] * (BONUS_CHOICES - 1) / BONUS_CHOICES,
+        "4등": n * per_match[4],
+        "5등": n * per_match[3],
+    }
+
+    coverage = {}
+    if tickets:
+        from LOTTO_WHEEL import coverage as subset_coverage
+        coverage = {t: subset_coverage(tickets, t=t) for t in (2, 3)}
+
+    return {
+        "tickets": n,
+        "draws": TOTAL_DRAWS,
+        "at_least": {k: draws_where(lambda v, k=k: v >> k) / TOTAL_DRAWS for k in range(3, 7)},
+        "tiers": {tier: {"any": float(any_counts[tier]) / TOTAL_DRAWS, "expected": expected[tier]} for tier in TIERS},
+        "best": {tier: float(count) / TOTAL_DRAWS for tier, count in best_counts.items()},
+        "coverage": coverage,
+    }
+
+def main(argv=None):
+    import argparse
+    import json
+
+    from LOTTO_LOGIC import GENERATION_METHODS, LottoLogic
+
+    keys = [method["key"] for method in GENERATION_METHODS if not method["data_required"]]
+    parser = argparse.ArgumentParser(description="게임 세트의 정확한 당첨 확률")
+    parser.add_argument("--method", action="append", choices=keys, help="비교할 생성 방식 (여러 번 지정 가능)")
+    parser.add_argument("-n", type=int, default=100, help="방식별 게임 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--tickets", help="게임 목록 JSON 파일 ([[1, 2, 3, 4, 5, 6], ...])")
+    args = parser.parse_args(argv)
+
+    sets = {}
+    if args.tickets:
+        with open(args.tickets, encoding="utf-8") as f:
+            sets[args.tickets] = json.load(f)
+    logic = LottoLogic()
+    for key in args.method or ([] if args.tickets else ["random"]):
+        sets[key] = logic.generate_batch(key, args.n, np.random.default_rng(args.seed)).tolist()
+
+    for name, tickets in sets.items():
+        odds = ticket_odds(tickets, workers=args.workers)
+        print(f"[{name}] {odds['tickets']}게임")
+        for k, p in odds["at_least"].items():
+            print(f"  {k}개 이상 일치  {p:.6%}")
+        for tier in TIERS:
+            tier_odds = odds["tiers"][tier]
+            print(f"  {tier}  하나 이상 {tier_odds['any']:.6%}  기대 {tier_odds['expected']:.6f}")
+        print(f"  {NO_PRIZE}  {odds['best'][NO_PRIZE]:.6%}")
+        for t, (covered, total) in odds["coverage"].items():
+            print(f"  {t}개 조합 커버 {covered}/{total}")
+    return 0
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
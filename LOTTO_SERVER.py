@@ -0,0 +1,280 @@
+"""
+LOTTO_SERVER.py - 번호 생성/당첨 확인 HTTP 서비스 (Kivy 없이 asyncio 표준 라이브러리만 사용)
+시작할 때 회차를 한 번 불러와 분석한 LottoLogic 하나를 모든 요청이 공유하고,
+게임 수가 많거나 세트 단위인 생성/확인은 같은 로직을 가진 프로세스 풀로 넘겨 이벤트 루프를 막지 않음
+
+    python main.py serve --port 8080
+    GET  /generate?method=random&n=5[&seed=1][&max_overlap=3]
+    GET  /check?numbers=1,2,3,4,5,6[&numbers=...][&round=1100]
+    POST /check  {"tickets": [[1, 2, 3, 4, 5, 6]], "round": 1100}
+    GET  /health
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from LOTTO_BITMASK import masks_from_array, np_popcount, to_mask
+from LOTTO_LOGIC import LottoLogic, GENERATION_METHODS
+
+HOST = "127.0.0.1"
+PORT = 8080
+MAX_GAMES = 10000        # 요청 하나의 최대 게임 수
+INLINE_MAX = 64          # 이 이하는 이벤트 루프에서 바로 처리 (풀 왕복보다 빠름)
+MAX_HEADER = 16 * 1024
+MAX_BODY = 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 15.0
+
+METHODS = {method["key"]: method for method in GENERATION_METHODS}
+# 일치 개수 -> 등수 (회차 데이터에 보너스 번호가 없으므로 5개 일치는 2/3등)
+PRIZE_TIERS = {6: "1등", 5: "2/3등", 4: "4등", 3: "5등"}
+
+_STATUS = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+# 프로세스마다 하나 - 메인 프로세스는 LottoService, 워커는 풀 initializer 로 설정
+_logic = None
+_rounds = {}
+
+def _init_worker(rounds, draws):
+    global _logic, _rounds
+    _logic = LottoLogic([list(game) for game in draws])
+    _rounds = {round_no: index for index, round_no in enumerate(rounds)}
+
+def _ready():
+    return True
+
+def generate(method, n, seed=None, max_overlap=None):
+    """n 게임 생성 (seed 가 있으면 재현 가능)"""
+    rng = np.random.default_rng(seed)
+    return _logic.generate_batch(method, n, rng, max_overlap=max_overlap).tolist()
+
+def check(tickets, round_no=None):
+    """게임들을 한 회차(기본: 마지막 회차) 당첨번호와 비교 + 과거 전체 회차와의 최대 일치 개수"""
+    if not _rounds:
+        raise LookupError("회차 데이터가 없습니다")
+    round_no = max(_rounds) if round_no is None else round_no
+    if round_no not in _rounds:
+        raise LookupError(f"{round_no}회 데이터가 없습니다")
+    draw = _logic.draw(_rounds[round_no])
+    matched = np_popcount(masks_from_array(tickets) & np.uint64(to_mask(draw))).tolist()
+    index = _logic.draw_index()
+    return {
+        "round": round_no,
+        "draw": draw,
+        "results": [{"numbers": ticket, "matched": count, "tier": PRIZE_TIERS.get(count),
+                     "max_overlap": index.max_overlap(ticket)} for ticket, count in zip(tickets, matched)],
+    }
+
+class LottoService:
+    """요청 라우팅 - 작은 작업은 바로, 큰 작업은 프로세스 풀에서 실행"""
+
+    def __init__(self, rounds, draws, workers=None):
+        _init_worker(rounds, draws)
+        _logic.draw_index()  # 첫 요청 지연 방지
+        self.rounds = len(rounds)
+        self.last_round = rounds[-1] if rounds else 0
+        workers = workers if workers is not None else os.cpu_count() or 1
+        self.pool = None
+        if workers:
+            # fork 는 요청 중에 워커를 만들면 열린 클라이언트 소켓까지 물려받으므로 깨끗한 프로세스에서 시작
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                            initargs=(list(rounds), [list(game) for game in draws]))
+            # 연결을 받기 전에 워커를 모두 띄워 둠 (첫 큰 요청에서 시작 비용을 치르지 않도록)
+            for future in [self.pool.submit(_ready) for _ in range(workers)]:
+                future.result()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def _run(self, heavy, fn, *args):
+        if heavy and self.pool is not None:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+        return fn(*args)
+
+    async def handle(self, method, target, body):
+        """(상태 코드, JSON 으로 보낼 값)"""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        if url.path == "/health":
+            return 200, {"status": "ok", "rounds": self.rounds, "last_round": self.last_round}
+        if url.path == "/generate":
+            if method != "GET":
+                return 405, {"error": "GET 만 지원합니다"}
+            key = _param(query, "method", "random")
+            if key not in METHODS:
+                raise ValueError(f"알 수 없는 생성 방법: {key}")
+            n = _int_param(query, "n", 1)
+            if not 1 <= n <= MAX_GAMES:
+                raise ValueError(f"n 은 1~{MAX_GAMES} 이어야 합니다")
+            seed = _int_param(query, "seed", None)
+            max_overlap = _int_param(query, "max_overlap", None)
+            heavy = n > INLINE_MAX or METHODS[key].get("set_level", False)
+            games = await self._run(heavy, generate, key, n, seed, max_overlap)
+            return 200, {"method": key, "games": games}
+        if url.path == "/check":
+            if method == "POST":
+                payload = json.loads(body or b"{}")
+                if not isinstance(payload, dict):
+                    raise ValueError("본문은 JSON 객체여야 합니다")
+                tickets, round_no = payload.get("tickets", []), payload.get("round")
+                if not isinstance(tickets, list) or not all(
+                        isinstance(ticket, list) and len(ticket) == 6 and all(type(num) is int for num in ticket)
+                        for ticket in tickets):
+                    raise ValueError("tickets 는 정수 6개 목록들의 목록이어야 합니다")
+                if round_no is not None and type(round_no) is not int:
+                    raise ValueError("round 는 정수여야 합니다")
+            elif method == "GET":
+                tickets = [[int(num) for num in value.split(",")] for value in query.get("numbers", [])]
+                round_no = _int_param(query, "round", None)
+            else:
+                return 405, {"error": "GET/POST 만 지원합니다"}
+            tickets = [sorted(int(num) for num in ticket) for ticket in tickets]
+            if not 1 <= len(tickets) <= MAX_GAMES:
+                raise ValueError(f"게임은 1~{MAX_GAMES}개 이어야 합니다")
+            for ticket in tickets:
+                if len(set(ticket)) != 6 or not all(1 <= num <= 45 for num in ticket):
+                    raise ValueError(f"잘못된 게임: {ticket}")
+            return 200, await self._run(len(tickets) > INLINE_MAX, check, tickets, round_no)
+        return 404, {"error": f"없는 경로: {url.path}"}
+
+def _param(query, name, default):
+    values = query.get(name)
+    return values[-1] if values else default
+
+def _int_param(query, name, default):
+    value = _param(query, name, None)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} 은 정수여야 합니다") from None
+
+def _response(status, payload, keep_alive):
+    body = b"" if payload is None else json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_STATUS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+        "Access-Control-Allow-Headers: Content-Type\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+async def _serve_connection(service, reader, writer):
+    """연결 하나 - keep-alive 로 여러 요청 처리"""
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                return
+            except asyncio.LimitOverrunError:
+                writer.write(_response(413, {"error": "헤더가 너무 큽니다"}, False))
+                return
+
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                writer.write(_response(400, {"error": "잘못된 요청"}, False))
+                return
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" and (version != "HTTP/1.0" or connection == "keep-alive")
+
+            try:
+                length = int(headers.get("content-length") or 0)
+                if length < 0:
+                    raise ValueError
+            except ValueError:
+                writer.write(_response(400, {"error": "잘못된 Content-Length"}, False))
+                await writer.drain()
+                return
+            if length > MAX_BODY:
+                writer.write(_response(413, {"error": "본문이 너무 큽니다"}, False))
+                await writer.drain()
+                return
+            body = await reader.readexactly(length) if length else b""
+
+            if method == "OPTIONS":
+                status, payload = 204, None
+            else:
+                try:
+                    status, payload = await service.handle(method, target, body)
+                except (ValueError, TypeError, LookupError) as e:
+                    status, payload = 400, {"error": str(e)}
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                return
+    finally:
+        writer.close()
+
+def load_history(cache_path=None, offline=False):
+    """(회차, 번호) 목록 - 번들 스냅샷 + 회차 캐시 + (온라인이면) Supabase 이후 회차"""
+    from LOTTO_DATA import SUPABASE_URL, SUPABASE_KEY, DrawCache, PostgrestTransport, fetch_draws_paged
+    from LOTTO_SNAPSHOT import load_snapshot
+
+    store = DrawCache(cache_path)
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        with snapshot:
+            store.append(snapshot.rows())
+    if not offline and SUPABASE_URL and SUPABASE_KEY:
+        transport = PostgrestTransport(SUPABASE_URL, SUPABASE_KEY)
+        try:
+            fetch_draws_paged(transport, store)
+        except Exception as e:
+            print(f"회차 수집 오류 (보유 데이터로 계속): {e}", file=sys.stderr)
+        finally:
+            transport.close()
+    return store.rounds, store.draws
+
+async def serve(service, host=HOST, port=PORT):
+    server = await asyncio.start_server(lambda r, w: _serve_connection(service, r, w), host, port, limit=MAX_HEADER)
+    print(f"{service.rounds}개 회차 (마지막 {service.last_round}회) · http://{host}:{port}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="번호 생성/당첨 확인 HTTP 서비스")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=None, help="큰 작업용 프로세스 수 (0 = 모두 이벤트 루프에서)")
+    parser.add_argument("--cache", help="회차 캐시 파일 (있으면 이후 회차만 Supabase 에서 받음)")
+    parser.add_argument("--offline", action="store_true", help="Supabase 요청 없이 스냅샷/캐시만 사용")
+    args = parser.parse_args(argv)
+
+    rounds, draws = load_history(args.cache, args.offline)
+    service = LottoService(rounds, draws, args.workers)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
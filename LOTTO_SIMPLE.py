@@ -10,46 +10,31 @@ from kivy.uix.label import Label
 from kivy.uix.spinner import Spinner
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, Ellipse
 import random
 
-class LottoBall(Widget):
+from LOTTO_LOGIC import constrained_sampler, BALANCE_ODD, RANGE_QUOTAS
+from LOTTO_BALLS import BallTextures, TexturedBall
+
+def ball_color(number):
+    """번호별 색상 설정"""
+    if number <= 10:
+        return (1, 0.84, 0, 1)  # 금색
+    elif number <= 20:
+        return (0.2, 0.6, 1, 1)  # 파란색
+    elif number <= 30:
+        return (1, 0.2, 0.2, 1)  # 빨간색
+    elif number <= 40:
+        return (0.5, 0.5, 0.5, 1)  # 회색
+    else:
+        return (0.4, 0.8, 0.2, 1)  # 초록색
+
+class LottoBall(TexturedBall):
+    textures = BallTextures(ball_color, font_ratio=1 / 3)
+    
     def __init__(self, number=0, **kwargs):
-        super().__init__(**kwargs)
-        self.number = number
+        super().__init__(number, **kwargs)
         self.size_hint = (None, None)
         self.size = (60, 60)
-        
-        with self.canvas:
-            # 번호별 색상 설정
-            if number <= 10:
-                Color(1, 0.84, 0)  # 금색
-            elif number <= 20:
-                Color(0.2, 0.6, 1)  # 파란색
-            elif number <= 30:
-                Color(1, 0.2, 0.2)  # 빨간색
-            elif number <= 40:
-                Color(0.5, 0.5, 0.5)  # 회색
-            else:
-                Color(0.4, 0.8, 0.2)  # 초록색
-            
-            self.circle = Ellipse(pos=self.pos, size=self.size)
-        
-        # 번호 텍스트
-        self.label = Label(
-            text=str(number),
-            color=(1, 1, 1, 1),
-            font_size=20,
-            pos=self.pos,
-            size=self.size
-        )
-        self.add_widget(self.label)
-        
-        self.bind(pos=self.update_graphics)
-        
-    def update_graphics(self, *args):
-        self.circle.pos = self.pos
-        self.label.pos = self.pos
 
 class SimpleLottoApp(App):
     def build(self):
@@ -123,29 +108,11 @@ class SimpleLottoApp(App):
     
     def generate_balanced(self):
         """홀수/짝수 균형 맞춘 생성"""
-        attempts = 0
-        while attempts < 100:
-            numbers = self.generate_random()
-            odd_count = sum(1 for n in numbers if n % 2 == 1)
-            if 2 <= odd_count <= 4:
-                return numbers
-            attempts += 1
-        return self.generate_random()
+        return constrained_sampler(odd=BALANCE_ODD).sample()
     
     def generate_range(self):
         """구간별 분포 생성"""
-        numbers = []
-        ranges = [(1, 15), (16, 30), (31, 45)]
-        
-        for start, end in ranges:
-            count = 0
-            while count < 2 and len(numbers) < 6:
-                num = random.randint(start, end)
-                if num not in numbers:
-                    numbers.append(num)
-                    count += 1
-        
-        return sorted(numbers)
+        return constrained_sampler(ranges=RANGE_QUOTAS).sample()
     
     def generate_numbers(self, instance):
         """번호 생성 메인 함수"""
@@ -0,0 +1,149 @@
+"""
+LOTTO_SIMULATE.py - 생성 방법별 몬테카를로 시뮬레이션
+균등 추첨(보너스 포함)을 대량으로 만들고 추첨마다 방법별 게임 하나를 생성해 등수별 당첨률과 신뢰구간 계산
+
+추첨은 BLOCK 단위 작업으로 나누고 작업 i 는 시드에서 파생한 i 번째 독립 난수열만 사용 -
+작업별 정수 집계를 더하므로 워커 수와 무관하게 결과가 비트 단위로 같음
+
+    python LOTTO_SIMULATE.py --draws 1000000 --seed 42
+"""
+
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from LOTTO_BITMASK import masks_from_array, np_popcount
+from LOTTO_LOGIC import LottoLogic, GENERATION_METHODS
+
+# 작업 하나가 처리하는 추첨 수 (결과가 워커 수와 무관하도록 고정)
+BLOCK = 65536
+CONFIDENCE = 0.95
+
+TIERS = ("1등", "2등", "3등", "4등", "5등")
+# 무작위 게임 하나의 정확한 등수별 확률 (균등 추첨 기준 - 생성 방법과 무관)
+EXACT_RATES = {
+    "1등": 1 / math.comb(45, 6),
+    "2등": 6 / math.comb(45, 6),
+    "3등": 6 * 38 / math.comb(45, 6),
+    "4등": math.comb(6, 4) * math.comb(39, 2) / math.comb(45, 6),
+    "5등": math.comb(6, 3) * math.comb(39, 3) / math.comb(45, 6),
+}
+
+def _block_rng(entropy, index):
+    """작업별 독립 난수 생성기"""
+    return np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(index,)))
+
+def _run_block(past_winnings, keys, size, entropy, index):
+    """추첨 size 개 시뮬레이션 - 방법별 [낙첨, 5등, 4등, 3등, 2등, 1등] 게임 수"""
+    rng = _block_rng(entropy, index)
+    logic = LottoLogic([list(game) for game in past_winnings])
+    # 45개 중 7개 비복원 추출 - 앞 6개가 당첨번호, 마지막이 보너스
+    balls = LottoLogic._partial_shuffle(size, 45, 7, rng) + 1
+    draws = masks_from_array(balls[:, :6])
+    bonus = np.left_shift(np.uint64(1), (balls[:, 6] - 1).astype(np.uint64))
+
+    counts = np.zeros((len(keys), 6), dtype=np.int64)
+    for row, key in enumerate(keys):
+        tickets = masks_from_array(logic.generate_batch(key, size, rng))
+        matched = np_popcount(tickets & draws).astype(np.intp)
+        # 5개 일치 + 보너스 = 2등 (등수 칸 4), 6개 일치 = 1등 (칸 5)
+        second = (matched == 5) & ((tickets & bonus) != 0)
+        tier = np.array([0, 0, 0, 1, 2, 3, 5], dtype=np.intp)[matched]
+        tier[second] = 4
+        counts[row] += np.bincount(tier, minlength=6)
+    return counts
+
+def wilson_interval(wins, n, confidence=CONFIDENCE):
+    """이항 비율의 Wilson 점수 신뢰구간 (당첨이 0번이어도 상한이 0이 아님)"""
+    if not n:
+        return 0.0, 1.0
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    p = wins / n
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+def simulate(past_winnings=(), keys=None, draws=1_000_000, seed=None, workers=None, confidence=CONFIDENCE):
+    """생성 방법별 등수 당첨률 - {key: {"name", "draws", "counts", "tiers": {등수: {"wins", "rate", "ci"}}, "any"}}
+
+    seed 가 같으면 workers 와 무관하게 같은 결과 (None 이면 매번 새 시드, 반환값의 "seed" 로 재현 가능)
+    """
+    if keys is None:
+        # 세트 단위 방법은 추첨마다 게임 하나를 뽑는 방식과 맞지 않으므로 기본 목록에서 제외 (keys 로 지정 가능)
+        keys = [method["key"] for method in GENERATION_METHODS if not method.get("set_level")]
+    keys = list(keys)
+    past_winnings = [sorted(game) for game in past_winnings]
+    entropy = np.random.SeedSequence(seed).entropy
+
+    blocks = [(index, min(BLOCK, draws - start)) for index, start in enumerate(range(0, draws, BLOCK))]
+    total = np.zeros((len(keys), 6), dtype=np.int64)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(blocks) == 1:
+        for index, size in blocks:
+            total += _run_block(past_winnings, keys, size, entropy, index)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_block, past_winnings, keys, size, entropy, index) for index, size in blocks]
+            for future in futures:
+                total += future.result()
+
+    names = {method["key"]: method["name"] for method in GENERATION_METHODS}
+    results = {"seed": entropy}
+    for row, key in enumerate(keys):
+        counts = total[row].tolist()
+        tiers = {}
+        for column, tier in zip((5, 4, 3, 2, 1), TIERS):
+            wins = counts[column]
+            tiers[tier] = {"wins": wins, "rate": wins / draws if draws else 0.0,
+                           "ci": wilson_interval(wins, draws, confidence)}
+        wins = draws - counts[0]
+        results[key] = {
+            "name": names.get(key, key),
+            "draws": draws,
+            "counts": counts,
+            "tiers": tiers,
+            "any": {"wins": wins, "rate": wins / draws if draws else 0.0, "ci": wilson_interval(wins, draws, confidence)},
+        }
+    return results
+
+def main(argv=None):
+    import argparse
+
+    keys = [method["key"] for method in GENERATION_METHODS]
+    parser = argparse.ArgumentParser(description="생성 방법별 몬테카를로 당첨률")
+    parser.add_argument("--draws", type=int, default=1_000_000, help="시뮬레이션 추첨 수")
+    parser.add_argument("--seed", type=int, default=None, help="같은 시드면 워커 수와 무관하게 같은 결과")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--method", action="append", choices=keys, help="시뮬레이션할 생성 방식 (여러 번 지정 가능)")
+    parser.add_argument("--cache", help="분석에 쓸 회차 캐시 파일 (없으면 번들 스냅샷)")
+    parser.add_argument("--confidence", type=float, default=CONFIDENCE)
+    args = parser.parse_args(argv)
+
+    history = []
+    if args.cache:
+        from LOTTO_DATA import DrawCache
+        history = DrawCache(args.cache).draws
+    else:
+        from LOTTO_SNAPSHOT import load_snapshot
+        snapshot = load_snapshot()
+        if snapshot is not None:
+            with snapshot:
+                history = snapshot.games()
+
+    results = simulate(history, args.method, args.draws, args.seed, args.workers, args.confidence)
+    print(f"시드 {results.pop('seed')} · 과거 {len(history)}개 회차 · 추첨 {args.draws}개 · 신뢰수준 {args.confidence:.0%}")
+    for key, result in results.items():
+        print(f"[{result['name']}]")
+        for tier in TIERS + ("당첨",):
+            stats = result["tiers"][tier] if tier in result["tiers"] else result["any"]
+            low, high = stats["ci"]
+            exact = EXACT_RATES.get(tier, sum(EXACT_RATES.values()))
+            print(f"  {tier}  {stats['wins']:>9}  {stats['rate']:.3e}  [{low:.3e}, {high:.3e}]  (정확값 {exact:.3e})")
+    return 0
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
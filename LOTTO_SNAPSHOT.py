@@ -0,0 +1,155 @@
+"""
+LOTTO_SNAPSHOT.py - 앱에 함께 배포하는 당첨번호/통계 스냅샷
+회차, 번호, 비트마스크와 번호/합계/동반 출현 빈도를 고정 배치 바이너리로 저장하고 mmap 으로 읽음 (Kivy 의존성 없음)
+
+    python LOTTO_SNAPSHOT.py                       # Supabase 에서 받아 lotto_snapshot.bin 생성
+    python LOTTO_SNAPSHOT.py --cache lotto_draws.bin   # 로컬 회차 캐시로 생성
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+SNAPSHOT_FILE = "lotto_snapshot.bin"
+SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), SNAPSHOT_FILE)
+
+MAGIC = b"LGSN"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxI")  # 매직, 버전, 회차 수
+MAX_SUM = 255                       # 6개 번호 합계 최댓값 (40+...+45)
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+def _layout(count):
+    """구간별 (이름, 형식, 원소 수, 시작 위치) 와 전체 크기 - 각 구간은 8바이트 정렬"""
+    sections = []
+    offset = HEADER.size
+    for name, fmt, size in (
+        ("rounds", "H", count),
+        ("numbers", "B", count * 6),
+        ("masks", "Q", count),
+        ("number_freq", "I", 46),
+        ("sum_freq", "I", MAX_SUM + 1),
+        ("pair_counts", "I", 46 * 46),
+    ):
+        offset = _align(offset)
+        sections.append((name, fmt, size, offset))
+        offset += size * struct.calcsize(fmt)
+    return sections, offset
+
+class Snapshot:
+    """읽기 전용 스냅샷 - 각 구간은 파일을 복사하지 않는 memoryview"""
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        if sys.byteorder != "little":
+            raise ValueError("리틀 엔디언 기기만 지원")
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            magic, version, count = HEADER.unpack_from(self._mmap)
+            sections, size = _layout(count)
+            if magic != MAGIC or version != VERSION or len(self._mmap) != size:
+                raise ValueError(f"잘못된 스냅샷 파일: {path}")
+            view = memoryview(self._mmap)
+            self._views.append(view)
+            for name, fmt, length, offset in sections:
+                section = view[offset:offset + length * struct.calcsize(fmt)].cast(fmt)
+                self._views.append(section)
+                setattr(self, name, section)
+        except Exception:
+            self.close()
+            raise
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def last_round(self):
+        return self.rounds[-1] if self.count else 0
+
+    def games(self):
+        """정렬된 번호 목록들 (회차 순)"""
+        data = self.numbers.tobytes()
+        return [list(data[i:i + 6]) for i in range(0, len(data), 6)]
+
+    def rows(self):
+        """(회차, 번호) 목록 - DrawCache.append 입력 형식"""
+        return list(zip(self.rounds.tolist(), self.games()))
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """번들 스냅샷 열기 - 없거나 손상되었으면 None"""
+    try:
+        return Snapshot(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+def write_snapshot(path, rounds, draws):
+    """회차/번호로 스냅샷 생성 - 통계는 LottoLogic 으로 집계해 앱과 같은 값을 저장"""
+    from LOTTO_LOGIC import LottoLogic
+
+    draws = [sorted(game) for game in draws]
+    logic = LottoLogic([list(game) for game in draws])
+    sections, size = _layout(len(draws))
+    values = {
+        "rounds": rounds,
+        "numbers": [num for game in draws for num in game],
+        "masks": logic.draw_masks,
+        "number_freq": [logic.number_freq.get(num, 0) for num in range(46)],
+        "sum_freq": [logic.sum_freq.get(total, 0) for total in range(MAX_SUM + 1)],
+        "pair_counts": logic.pair_counts,
+    }
+    data = bytearray(size)
+    HEADER.pack_into(data, 0, MAGIC, VERSION, len(draws))
+    for name, fmt, length, offset in sections:
+        struct.pack_into(f"<{length}{fmt}", data, offset, *values[name])
+
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+    os.replace(temp, path)
+
+def main(argv=None):
+    import argparse
+
+    from LOTTO_DATA import SUPABASE_URL, SUPABASE_KEY, DrawCache, PostgrestTransport, fetch_draws_paged
+
+    parser = argparse.ArgumentParser(description="당첨번호 스냅샷 생성")
+    parser.add_argument("--cache", help="회차 캐시 파일 (있으면 이후 회차만 Supabase 에서 받음)")
+    parser.add_argument("--offline", action="store_true", help="Supabase 요청 없이 캐시만 사용")
+    parser.add_argument("--output", default=SNAPSHOT_PATH, help="스냅샷 경로")
+    args = parser.parse_args(argv)
+
+    store = DrawCache(args.cache)
+    if not args.offline:
+        transport = PostgrestTransport(SUPABASE_URL, SUPABASE_KEY)
+        try:
+            fetch_draws_paged(transport, store)
+        finally:
+            transport.close()
+    if not store.draws:
+        print("회차 데이터가 없습니다", file=sys.stderr)
+        return 1
+
+    write_snapshot(args.output, store.rounds, store.draws)
+    print(f"{len(store.draws)}개 회차 (마지막 {store.last_round}회) -> {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+LOTTO_TICKETS.py - 생성한 게임 기록과 당첨 확인
+(대상 회차, 생성 방법, 번호 마스크) 고정 길이 레코드를 파일 끝에 추가만 하고, 읽을 때는 numpy 구조체 배열로 한 번에 불러옴
+새 회차가 들어오면 아직 확인하지 않은 게임 전체를 한 번의 벡터 연산으로 확인하고 당첨 게임 위치를 색인
+"""
+
+import os
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy가 없으면 게임 기록 비활성화 (next_round 는 계속 사용 가능)
+    np = None
+
+from LOTTO_BITMASK import from_mask, masks_from_array, np_popcount, to_mask
+from LOTTO_METHODS import GENERATION_METHODS
+
+TICKETS_FILE = "lotto_tickets.bin"
+
+# 레코드: 번호 마스크, 대상 회차, 생성 방법 번호 (GENERATION_METHODS 순서 - 새 방법은 끝에 추가)
+RECORD = np.dtype([("mask", "<u8"), ("round", "<u2"), ("method", "u1")]) if np is not None else None
+METHOD_KEYS = [method["key"] for method in GENERATION_METHODS]
+UNKNOWN_METHOD = 255
+
+PENDING = 255   # 아직 추첨 전 (matches/ranks 값)
+
+# 일치 개수 -> 등수 (5개 일치는 보너스 번호로 2/3등 구분 - 보너스를 모르면 3등)
+_RANK_BY_MATCH = np.array([0, 0, 0, 5, 4, 3, 1], dtype=np.uint8) if np is not None else None
+
+def next_round(last_round=0):
+    """지금 생성한 게임의 대상 회차 - 알려진 마지막 회차와 날짜 기준 마지막 추첨 회차 중 큰 값 + 1"""
+    from LOTTO_DATA import latest_expected_round
+    return max(last_round, latest_expected_round()) + 1
+
+class TicketStore:
+    """생성 게임 기록 (스레드 안전) - 당첨 결과는 파일에 두지 않고 열 때 회차 데이터로 다시 확인"""
+
+    def __init__(self, path=None):
+        if np is None:
+            raise ImportError("게임 기록에는 numpy가 필요합니다")
+        self.path = path
+        self._lock = threading.Lock()
+        self.records = np.empty(0, dtype=RECORD)
+        self.matches = np.empty(0, dtype=np.uint8)
+        self.bonus = np.empty(0, dtype=bool)
+        self._draws = {}   # 회차 -> (마스크, 보너스 또는 None)
+        self._wins = np.empty(0, dtype=np.intp)
+        self.checked_round = 0   # 지난 실행까지 확인을 마친 마지막 회차 (이 회차까지의 당첨은 이미 알림)
+        self._load()
+
+    def __len__(self):
+        return len(self.records)
+
+    def _load(self):
+        """기록 파일과 확인한 회차 읽기 - 기록 중 중단된 마지막 레코드는 잘라냄"""
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return
+
+        valid = len(data) - len(data) % RECORD.itemsize
+        self.records = np.frombuffer(data, dtype=RECORD, count=valid // RECORD.itemsize).copy()
+        self.matches = np.full(len(self.records), PENDING, dtype=np.uint8)
+        self.bonus = np.zeros(len(self.records), dtype=bool)
+        if valid != len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid)
+        try:
+            with open(self.path + ".checked", encoding="ascii") as f:
+                self.checked_round = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            pass
+
+    def append(self, round_no, method, games):
+        """대상 회차의 게임 목록 추가 - 이미 추첨된 회차면 바로 확인"""
+        games = np.asarray(games, dtype=np.uint8).reshape(-1, 6)
+        if not len(games):
+            return
+        records = np.empty(len(games), dtype=RECORD)
+        records["mask"] = masks_from_array(games)
+        records["round"] = round_no
+        records["method"] = METHOD_KEYS.index(method) if method in METHOD_KEYS else UNKNOWN_METHOD
+
+        with self._lock:
+            if self.path:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, 'ab') as f:
+                    f.write(records.tobytes())
+            start = len(self.records)
+            self.records = np.concatenate([self.records, records])
+            self.matches = np.concatenate([self.matches, np.full(len(records), PENDING, dtype=np.uint8)])
+            self.bonus = np.concatenate([self.bonus, np.zeros(len(records), dtype=bool)])
+            if round_no in self._draws:
+                self._check(np.arange(start, len(self.records)))
+
+    def check(self, draws):
+        """(회차, 번호) 또는 (회차, 번호, 보너스) 목록 반영 - 새로 확인한 당첨 게임 위치 반환"""
+        with self._lock:
+            for row in draws:
+                round_no, numbers = row[0], row[1]
+                bonus = (row[2] if len(row) > 2 else None) or None   # 0 = 모름
+                known = self._draws.get(round_no)
+                if known is None or (bonus is not None and known[1] is None):
+                    self._draws[round_no] = (to_mask(numbers), bonus)
+                    if known is not None:
+                        # 보너스 번호를 새로 알게 된 회차는 다시 확인
+                        self.matches[self.records["round"] == round_no] = PENDING
+            return self._check(np.flatnonzero(self.matches == PENDING))
+
+    def new_wins(self, positions):
+        """당첨 위치 중 checked_round 이후 회차만 (재실행할 때마다 같은 당첨을 다시 알리지 않도록)"""
+        positions = np.asarray(positions, dtype=np.intp)
+        with self._lock:
+            return positions[self.records["round"][positions] > self.checked_round]
+
+    def mark_checked(self, round_no):
+        """round_no 회차까지 확인했다고 기록 파일 옆에 저장"""
+        if round_no <= self.checked_round:
+            return
+        self.checked_round = round_no
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp = self.path + ".checked.tmp"
+        with open(temp, "w", encoding="ascii") as f:
+            f.write(str(round_no))
+        os.replace(temp, self.path + ".checked")
+
+    def _check(self, positions):
+        """positions 중 추첨된 회차의 게임을 한 번에 확인 (잠금 상태에서 호출)"""
+        if not len(positions) or not self._draws:
+            return np.empty(0, dtype=np.intp)
+        size = max(self._draws) + 1
+        draw_masks = np.zeros(size, dtype=np.uint64)
+        bonus_bits = np.zeros(size, dtype=np.uint64)
+        drawn = np.zeros(size, dtype=bool)
+        for round_no, (mask, bonus) in self._draws.items():
+            draw_masks[round_no] = mask
+            drawn[round_no] = True
+            if bonus:
+                bonus_bits[round_no] = 1 << (bonus - 1)
+
+        rounds = self.records["round"][positions].astype(np.intp)
+        inside = rounds < size
+        positions, rounds = positions[inside], rounds[inside]
+        positions, rounds = positions[drawn[rounds]], rounds[drawn[rounds]]
+        masks = self.records["mask"][positions]
+        self.matches[positions] = np_popcount(masks & draw_masks[rounds])
+        self.bonus[positions] = (masks & bonus_bits[rounds]) != 0
+
+        found = positions[self.matches[positions] >= 3]
+        if len(found):
+            self._wins = np.union1d(self._wins, found)
+        return found
+
+    def ranks(self, positions=None):
+        """게임별 등수 (1~5, 0 = 낙첨, PENDING = 추첨 전)"""
+        positions = np.arange(len(self.records)) if positions is None else np.asarray(positions, dtype=np.intp)
+        matches = self.matches[positions]
+        drawn = matches != PENDING
+        ranks = np.full(len(positions), PENDING, dtype=np.uint8)
+        ranks[drawn] = _RANK_BY_MATCH[matches[drawn]]
+        ranks[drawn & (matches == 5) & self.bonus[positions]] = 2
+        return ranks
+
+    def wins(self, rank=None, round_no=None):
+        """당첨 게임 목록 [{"round", "method", "numbers", "matched", "rank"}] - 당첨 색인에서만 조회"""
+        with self._lock:
+            positions = self._wins
+            if round_no is not None:
+                positions = positions[self.records["round"][positions] == round_no]
+            ranks = self.ranks(positions)
+            if rank is not None:
+                positions, ranks = positions[ranks == rank], ranks[ranks == rank]
+            return [self._describe(i, r) for i, r in zip(positions.tolist(), ranks.tolist())]
+
+    def _describe(self, position, rank):
+        record = self.records[position]
+        method = int(record["method"])
+        return {
+            "round": int(record["round"]),
+            "method": METHOD_KEYS[method] if method < len(METHOD_KEYS) else None,
+            "numbers": from_mask(int(record["mask"])),
+            "matched": int(self.matches[position]),
+            "rank": rank,
+        }
+
+    def summary(self, round_no=None):
+        """{"tickets": 게임 수, "pending": 추첨 전, "ranks": {등수: 게임 수}} (round_no 가 있으면 그 회차만)"""
+        with self._lock:
+            positions = np.arange(len(self.records))
+            if round_no is not None:
+                positions = positions[self.records["round"] == round_no]
+            ranks = self.ranks(positions)
+        counts = np.bincount(ranks[ranks != PENDING], minlength=6)
+        return {
+            "tickets": len(positions),
+            "pending": int(np.count_nonzero(ranks == PENDING)),
+            "ranks": {rank: int(counts[rank]) for rank in range(1, 6)},
+        }
@@ -0,0 +1,216 @@
+"""
+LOTTO_WHEEL.py - 여러 게임을 한 세트로 고르는 커버리지 조합 (휠링)
+게임은 45비트 마스크, 풀 번호의 t개 부분집합(쌍/삼중...)은 조합수 체계 순위로 세고
+탐욕 선택 + 교체 국소 탐색으로 서로 다른 게임들이 부분집합을 최대한 고르게 덮도록 함
+"""
+
+import itertools
+import math
+
+import numpy as np
+
+# 탐욕 단계마다 평가할 후보 게임 수 (절반은 가장 덜 덮인 부분집합을 포함하도록 생성)
+CANDIDATES = 64
+# 풀의 전체 조합 수가 이 이하이면 후보를 표본 대신 남은 조합 전체로 평가
+EXHAUSTIVE_LIMIT = 20000
+# 이 횟수 이상 덮인 부분집합은 추가 이득 0 으로 취급
+MAX_LEVEL = 60
+
+class Wheel:
+    """게임 세트와 부분집합별 덮인 횟수 - 목표는 sum(1 - 2^-횟수) 최대화 (덜 덮인 부분집합 우선)"""
+
+    def __init__(self, pool=None, t=2, rng=None, candidates=CANDIDATES, exclude=None):
+        pool = sorted(set(pool)) if pool is not None else list(range(1, 46))
+        if len(pool) < 6 or pool[0] < 1 or pool[-1] > 45:
+            raise ValueError("풀은 1~45 사이의 서로 다른 번호 6개 이상이어야 합니다")
+        if not 1 <= t <= 6:
+            raise ValueError("t 는 1~6 이어야 합니다")
+
+        self.pool = np.array(pool, dtype=np.intp)
+        self.v, self.t = len(pool), t
+        if not isinstance(rng, np.random.Generator):
+            # random.Random 도 허용 (LottoLogic 의 게임 하나 생성 API 와 같은 객체)
+            from LOTTO_LOGIC import as_generator
+            rng = as_generator(rng)
+        self.rng = rng
+        self.candidates = candidates
+        self.exclude = exclude  # (m, 6) 번호 배열 -> 제외할 행 (bool 배열), 예: DrawIndex.excluded
+        self.total = math.comb(self.v, 6)
+
+        self.comb = np.array([[math.comb(p, i) for i in range(t + 1)] for p in range(self.v + 1)], dtype=np.int64)
+        self.combos = np.array(list(itertools.combinations(range(6), t)), dtype=np.intp)
+        self.counts = np.zeros(math.comb(self.v, t), dtype=np.int64)
+        self.bits = np.left_shift(np.uint64(1), (self.pool - 1).astype(np.uint64))
+        self.marginal = 0.5 ** np.arange(1, MAX_LEVEL + 2)  # 횟수 c -> c+1 일 때 이득
+
+        self.positions = []  # 게임별 풀 위치 (정렬)
+        self.rows = []       # 게임별 부분집합 순위
+        self.ids = []        # 게임별 전체 조합 번호 (전수 평가 모드)
+        self.masks = set()
+
+        self._all = None
+        if self.total <= EXHAUSTIVE_LIMIT:
+            self._all = np.array(list(itertools.combinations(range(self.v), 6)), dtype=np.intp)
+            self._all_rows = self._subset_index(self._all)
+            self._free = np.ones(self.total, dtype=bool)
+            if exclude is not None:
+                self._free &= ~exclude(self.pool[self._all])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _subset_index(self, positions):
+        """(m, 6) 정렬된 위치 -> (m, C(6, t)) 부분집합 순위"""
+        index = np.zeros((len(positions), len(self.combos)), dtype=np.int64)
+        for j in range(self.t):
+            index += self.comb[positions[:, self.combos[:, j]], j + 1]
+        return index
+
+    def _unrank(self, ranks):
+        """부분집합 순위 -> (m, t) 위치"""
+        ranks = ranks.copy()
+        out = np.empty((len(ranks), self.t), dtype=np.intp)
+        for i in range(self.t, 0, -1):
+            p = np.searchsorted(self.comb[:, i], ranks, side='right') - 1
+            out[:, i - 1] = p
+            ranks -= self.comb[p, i]
+        return out
+
+    def _candidates(self):
+        """(위치, 부분집합 순위, 전체 조합 번호 또는 None)"""
+        if self._all is not None:
+            return self._all, self._all_rows, np.arange(self.total)
+
+        m, rng = self.candidates, self.rng
+        keys = rng.random((m, self.v))
+        low = np.flatnonzero(self.counts == self.counts.min())
+        seeded = m // 2
+        seeds = self._unrank(low[rng.integers(len(low), size=seeded)])
+        keys[np.arange(seeded)[:, None], seeds] = -1.0
+        positions = np.sort(np.argpartition(keys, 5, axis=1)[:, :6], axis=1)
+        return positions, self._subset_index(positions), None
+
+    def _best(self):
+        """이득이 가장 큰 새 게임 (없으면 None)과 그 이득"""
+        positions, rows, ids = self._candidates()
+        gain = self.marginal[np.minimum(self.counts[rows], MAX_LEVEL)].sum(axis=1)
+        if ids is not None:
+            gain[~self._free] = -1.0
+        elif self.exclude is not None:
+            gain[self.exclude(self.pool[positions])] = -1.0
+        while True:
+            best = int(np.argmax(gain))
+            if gain[best] < 0:
+                return None, -1.0
+            # 이미 고른 게임인지는 최선 후보만 확인
+            mask = int(self.bits[positions[best]].sum())
+            if mask not in self.masks:
+                return (positions[best], rows[best], mask, None if ids is None else int(ids[best])), gain[best]
+            gain[best] = -1.0
+
+    def _add(self, ticket, at=None):
+        positions, row, mask, tid = ticket
+        self.counts[row] += 1
+        self.masks.add(mask)
+        if tid is not None:
+            self._free[tid] = False
+        if at is None:
+            self.positions.append(positions)
+            self.rows.append(row)
+            self.ids.append(tid)
+        else:
+            self.positions[at], self.rows[at], self.ids[at] = positions, row, tid
+
+    def _remove(self, i):
+        """i 번째 게임을 통계에서 빼고 (목록 자리는 유지) 그 게임 반환"""
+        ticket = (self.positions[i], self.rows[i], int(self.bits[self.positions[i]].sum()), self.ids[i])
+        self.counts[ticket[1]] -= 1
+        self.masks.discard(ticket[2])
+        if ticket[3] is not None:
+            self._free[ticket[3]] = True
+        return ticket
+
+    def fill(self, n):
+        """탐욕 선택으로 n 게임까지 추가"""
+        if n > self.total:
+            raise ValueError(f"풀에서 만들 수 있는 서로 다른 게임은 {self.total}개입니다")
+        misses = 0
+        while len(self.positions) < n:
+            ticket, _ = self._best()
+            if ticket is None:
+                # 표본 후보가 모두 이미 고른 게임 - 거의 다 고른 경우만 발생
+                misses += 1
+                if misses > 1000:
+                    raise ValueError("조건을 만족하는 새 게임 후보를 찾지 못했습니다")
+                continue
+            self._add(ticket)
+
+    def improve(self, iterations):
+        """무작위 게임 하나를 빼고 더 나은 게임이 있으면 교체 (목표값이 줄지 않음)"""
+        if not self.positions:
+            return 0
+        swaps = 0
+        for _ in range(iterations):
+            i = int(self.rng.integers(len(self.positions)))
+            old = self._remove(i)
+            loss = self.marginal[np.minimum(self.counts[old[1]], MAX_LEVEL)].sum()
+            ticket, gain = self._best()
+            if ticket is not None and gain > loss + 1e-12:
+                self._add(ticket, at=i)
+                swaps += 1
+            else:
+                self._add(old, at=i)
+        return swaps
+
+    def cover(self):
+        """모든 t개 부분집합이 한 번 이상 덮일 때까지 추가한 뒤 중복 게임 제거"""
+        misses = 0
+        while self.counts.min() == 0:
+            ticket, _ = self._best()
+            if ticket is not None:
+                self._add(ticket)
+                continue
+            misses += 1
+            if misses > 1000 or self._all is not None:
+                raise ValueError("조건을 만족하면서 남은 부분집합을 덮을 게임을 찾지 못했습니다")
+        for i in reversed(range(len(self.positions))):
+            if self.counts[self.rows[i]].min() >= 2:
+                self._remove(i)
+                del self.positions[i], self.rows[i], self.ids[i]
+
+    def covered(self):
+        """(한 번 이상 덮인 부분집합 수, 전체 부분집합 수)"""
+        return int(np.count_nonzero(self.counts)), len(self.counts)
+
+    def numbers(self):
+        """(게임 수, 6) 정렬된 번호 배열"""
+        if not self.positions:
+            return np.empty((0, 6), dtype=np.intp)
+        return self.pool[np.array(self.positions)]
+
+def coverage_tickets(n, pool=None, t=2, rng=None, iterations=None, exclude=None):
+    """서로 다른 n 게임 - 풀의 t개 부분집합(기본: 번호 쌍)을 최대한 많이, 고르게 덮도록"""
+    wheel = Wheel(pool, t, rng, exclude=exclude)
+    wheel.fill(n)
+    wheel.improve(n if iterations is None else iterations)
+    return wheel.numbers()
+
+def covering_tickets(pool, t=3, rng=None, exclude=None):
+    """풀의 모든 t개 부분집합을 덮는 게임 목록 - 당첨번호 중 t개가 풀 안에 있으면 적어도 한 게임이 t개 이상 일치"""
+    wheel = Wheel(pool, t, rng, exclude=exclude)
+    wheel.cover()
+    return wheel.numbers()
+
+def coverage(games, pool=None, t=2):
+    """게임 목록이 덮는 풀의 t개 부분집합 (덮인 수, 전체 수)"""
+    wheel = Wheel(pool, t)
+    games = np.asarray(games, dtype=np.intp)
+    if not len(games):
+        return wheel.covered()
+    lookup = np.full(46, -1, dtype=np.intp)
+    lookup[wheel.pool] = np.arange(wheel.v)
+    positions = np.sort(lookup[games], axis=1)
+    if (positions < 0).any():
+        raise ValueError("풀에 없는 번호가 포함되어 있습니다")
+    np.add.at(wheel.counts, wheel._subset_index(positions).ravel(), 1)
+    return wheel.covered()
@@ -13,14 +13,14 @@ package.domain = com.lottogem.mobile
 source.dir = .
 
 # (list) Source files to include (let empty to include all the files)
-source.include_exts = py,png,jpg,kv,atlas,json
+source.include_exts = py,png,jpg,kv,atlas,json,bin
 
 # (str) Application versioning (method 1)
 version = 1.0
 
 # (list) Application requirements
 # comma separated e.g. requirements = sqlite3,kivy
-requirements = python3,kivy,requests,pillow,android
+requirements = python3,kivy,requests,pillow,numpy,android
 
 # (str) Presplash of the application
 #presplash.filename = %(source.dir)s/data/presplash.png
@@ -1,15 +1,57 @@
 """
 main.py - Buildozer를 위한 메인 엔트리 포인트
+
+LOTTO_PROFILE_IMPORTS=1 로 실행하면 모듈별 import 시간과 첫 프레임까지의 시간을 출력
+python main.py serve [--port 8080 ...] 는 Kivy 없이 HTTP 서비스(LOTTO_SERVER)만 실행
 """
 
-try:
-    # KivyMD 버전 시도
-    from LOTTO_MOBILE import LottoMobileApp
-    app = LottoMobileApp()
-except ImportError:
-    # KivyMD가 없으면 간단한 버전 사용
-    from LOTTO_SIMPLE import SimpleLottoApp
-    app = SimpleLottoApp()
-
-if __name__ == '__main__':
-    app.run()
\ No newline at end of file
+import os
+import sys
+import time
+
+SERVE = sys.argv[1:2] == ["serve"]
+
+if SERVE and __name__ == '__main__':
+    from LOTTO_SERVER import main as serve
+    sys.exit(serve(sys.argv[2:]))
+
+# 서비스 워커 프로세스(forkserver/spawn)는 이 파일을 __mp_main__ 으로 다시 읽으므로 앱 생성(Kivy)은 건너뜀
+if not SERVE:
+    _START = time.perf_counter()
+    PROFILE_IMPORTS = os.environ.get("LOTTO_PROFILE_IMPORTS") == "1"
+
+    if PROFILE_IMPORTS:
+        import LOTTO_METRICS as metrics
+        metrics.enable()
+        profiler = metrics.ImportProfiler().start()
+
+    try:
+        # KivyMD 버전 시도
+        from LOTTO_MOBILE import LottoMobileApp
+        app = LottoMobileApp()
+    except ImportError:
+        # KivyMD가 없으면 간단한 버전 사용
+        from LOTTO_SIMPLE import SimpleLottoApp
+        app = SimpleLottoApp()
+
+    if PROFILE_IMPORTS:
+        from kivy.clock import Clock
+
+        imported = time.perf_counter() - _START
+
+        def report_first_frame(dt):
+            """첫 프레임 후 - 작업 스레드의 import 가 끝날 때까지 기다리지 않고 지금까지의 결과 출력"""
+            first_frame = time.perf_counter() - _START
+            metrics.record("startup.imports", imported)
+            metrics.record("startup.first_frame", first_frame)
+            print(f"[startup] import {imported * 1000:.0f}ms, 첫 프레임 {first_frame * 1000:.0f}ms")
+            profiler.report()
+
+        app.bind(on_start=lambda *args: Clock.schedule_once(report_first_frame, 0))
+
+    if __name__ == '__main__':
+        app.run()
+        if PROFILE_IMPORTS:
+            # 작업 스레드에서 늦게 가져온 모듈까지 포함한 최종 결과
+            profiler.stop()
+            profiler.report()